@@ -0,0 +1,175 @@
+"""
+Activation functions for neurodes and the dense engine.
+
+Each activation has a scalar version for the neurodes and a NumPy array
+version for batched work. Derivatives are given in terms of the
+activation's output, which is what back propagation has on hand.
+"""
+
+from abc import ABC, abstractmethod
+import math
+
+import numpy as np
+
+
+class Activation(ABC):
+    """Parent class defines how an activation function should work."""
+
+    name = None  # used to save and load the activation by name
+
+    @property
+    def param(self):
+        """Get the activation's parameter, or None if it has none."""
+        return None
+
+    @abstractmethod
+    def value(self, total: float) -> float:
+        """Find the output for a neurode's weighted sum."""
+        pass
+
+    @abstractmethod
+    def derivative(self, output: float) -> float:
+        """Find the slope at the point that produced output."""
+        pass
+
+    @abstractmethod
+    def array(self, totals: np.ndarray) -> np.ndarray:
+        """Find the outputs for an array of weighted sums."""
+        pass
+
+    @abstractmethod
+    def array_derivative(self, outputs: np.ndarray) -> np.ndarray:
+        """Find the slopes for an array of outputs."""
+        pass
+
+    def __repr__(self) -> str:
+        """Show the activation with its parameter, if any."""
+        param = "" if self.param is None else repr(self.param)
+        return f"{self.__class__.__name__}({param})"
+
+    def __eq__(self, other) -> bool:
+        """Activations of the same type and parameter are equal."""
+        return type(self) is type(other) and self.param == other.param
+
+    def __hash__(self) -> int:
+        """Hash by type and parameter, to match __eq__."""
+        return hash((type(self), self.param))
+
+
+class Sigmoid(Activation):
+    """Logistic sigmoid, the original neurode activation."""
+
+    name = "sigmoid"
+
+    def value(self, total):
+        """Calculate 1 / (1 + e^-x)."""
+        return 1 / (1 + math.exp(-total))
+
+    def derivative(self, output):
+        """f(x) * (1-f(x)) formula."""
+        return output * (1 - output)
+
+    def array(self, totals):
+        """Calculate 1 / (1 + e^-x) for every element."""
+        return 1 / (1 + np.exp(-totals))
+
+    def array_derivative(self, outputs):
+        """f(x) * (1-f(x)) for every element."""
+        return outputs * (1 - outputs)
+
+
+class Tanh(Activation):
+    """Hyperbolic tangent, a sigmoid centered on zero."""
+
+    name = "tanh"
+
+    def value(self, total):
+        """Calculate tanh(x)."""
+        return math.tanh(total)
+
+    def derivative(self, output):
+        """1 - f(x)^2 formula."""
+        return 1 - output * output
+
+    def array(self, totals):
+        """Calculate tanh(x) for every element."""
+        return np.tanh(totals)
+
+    def array_derivative(self, outputs):
+        """1 - f(x)^2 for every element."""
+        return 1 - outputs * outputs
+
+
+class ReLU(Activation):
+    """Rectified linear unit, which does not saturate for x > 0."""
+
+    name = "relu"
+
+    def value(self, total):
+        """Calculate max(0, x)."""
+        return total if total > 0 else 0.0
+
+    def derivative(self, output):
+        """1 where the unit is active, else 0."""
+        return 1.0 if output > 0 else 0.0
+
+    def array(self, totals):
+        """Calculate max(0, x) for every element."""
+        return np.maximum(totals, 0.0)
+
+    def array_derivative(self, outputs):
+        """1 where the unit is active, else 0, for every element."""
+        return (outputs > 0).astype(outputs.dtype)
+
+
+class LeakyReLU(Activation):
+    """ReLU with a small slope for x < 0, so units never fully die."""
+
+    name = "leaky_relu"
+
+    def __init__(self, slope=0.01):
+        """Set the slope used for x < 0.
+
+        :param float slope: A small positive slope (default is 0.01).
+        """
+        if slope <= 0:
+            raise ValueError("Slope must be positive.")
+        self._slope = float(slope)
+
+    @property
+    def param(self):
+        """Get the slope used for x < 0."""
+        return self._slope
+
+    def value(self, total):
+        """Calculate x, or slope * x for x < 0."""
+        return total if total > 0 else self._slope * total
+
+    def derivative(self, output):
+        """1 where x > 0, else slope."""
+        return 1.0 if output > 0 else self._slope
+
+    def array(self, totals):
+        """Calculate x, or slope * x for x < 0, for every element."""
+        return np.where(totals > 0, totals, self._slope * totals)
+
+    def array_derivative(self, outputs):
+        """1 where x > 0, else slope, for every element."""
+        return np.where(outputs > 0, 1.0, self._slope).astype(outputs.dtype)
+
+
+ACTIVATIONS = {cls.name: cls for cls in (Sigmoid, Tanh, ReLU, LeakyReLU)}
+
+SIGMOID = Sigmoid()  # shared default for neurodes and layers
+
+
+def get_activation(name, param=None) -> Activation:
+    """Build an activation from its name and parameter.
+
+    :param str name: One of the names in ACTIVATIONS.
+    :param param: The activation's parameter, or None for its default.
+    """
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Unknown activation {name!r}.")
+    cls = ACTIVATIONS[name]
+    return cls() if param is None else cls(param)
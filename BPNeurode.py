@@ -5,6 +5,7 @@ Every neurode has its delta, which stands for an error.
 """
 
 from Neurode import Neurode
+from Activation import SIGMOID
 
 
 class BPNeurode(Neurode):
@@ -13,6 +14,8 @@ class BPNeurode(Neurode):
     For every neurode calculates delta and performs the weight update.
     """
 
+    __slots__ = ("_delta",)
+
     def __init__(self):
         """Call parent init first."""
         super().__init__()
@@ -22,13 +25,13 @@ class BPNeurode(Neurode):
     @staticmethod
     def _sigmoid_derivative(value):
         """f(x) * (1-f(x)) forumula."""
-        return value * (1 - value)
+        return SIGMOID.derivative(value)
 
     def _calculate_delta(self, expected_value=None):
         """Output layer case."""
         if expected_value is not None:
             error = expected_value - self._value
-            self._delta = error * self._sigmoid_derivative(self._value)
+            self._delta = error * self._activation.derivative(self._value)
             return
 
         """Hidden layer, loop through downstream nodes"""
@@ -37,7 +40,7 @@ class BPNeurode(Neurode):
             """Figure out which input I am to the next node"""
             total += next_node._weights[self] * next_node.delta
 
-        self._delta = total * self._sigmoid_derivative(self._value)
+        self._delta = total * self._activation.derivative(self._value)
 
     def data_ready_downstream(self, node):
         """Responds to data from downstream node during backdrop."""
@@ -0,0 +1,43 @@
+"""
+Atomic checkpoint files for resuming long training runs.
+
+A checkpoint is written to a temporary file in the same directory and
+then renamed over the old one, so a run that is killed part way through
+a write always leaves the previous checkpoint intact.
+"""
+
+import os
+import pickle
+import tempfile
+
+
+def save_checkpoint(path, state: dict) -> None:
+    """Atomically write a checkpoint to path.
+
+    :param path: File name of the checkpoint.
+    :param dict state: Everything needed to resume, as built by
+        FFBPNetwork.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def load_checkpoint(path) -> dict:
+    """Read a checkpoint written by save_checkpoint().
+
+    Checkpoints are pickles, so only load files you wrote yourself.
+
+    :param path: File name of the checkpoint.
+    :return: The saved state.
+    """
+    with open(path, "rb") as file:
+        return pickle.load(file)
@@ -0,0 +1,166 @@
+"""
+Dense matrix execution engine for a LayerList.
+
+The LayerList keeps the weights between each pair of layers in one
+NumPy matrix, so feed forward and back propagation run as matrix-vector
+operations instead of messages passed between neurodes. Inputs are cast
+to the dtype of the matrices, so a float32 network computes in float32
+throughout.
+"""
+
+import numpy as np
+
+
+class DenseEngine:
+    """Run a LayerList as one weight matrix per pair of layers.
+
+    Row j of a matrix holds the upstream weights of neurode j in the
+    downstream layer, so matrix @ values gives each weighted sum.
+    """
+
+    _optimizer = None
+
+    def __init__(self, layers, optimizer=None):
+        """Run on the weight matrices of a LayerList.
+
+        The matrices are shared with the neurodes, not copied, so both
+        always see the same weights.
+
+        :param LayerList layers: The layers of neurodes to run.
+        :param Optimizer optimizer: Optimizer that applies the weight
+            changes (default is None, plain gradient descent like the
+            neurodes).
+        """
+        self._layers = layers
+        self._optimizer = optimizer
+
+    @property
+    def weights(self):
+        """Return the list of weight matrices, input side first."""
+        return self._layers.weight_matrices
+
+    @property
+    def dtype(self):
+        """Get the float type the engine computes in."""
+        return self._layers.dtype
+
+    @property
+    def learning_rate(self) -> float:
+        """Get the learning rate shared by the neurodes."""
+        return self._layers.input_nodes[0].learning_rate
+
+    @property
+    def optimizer(self):
+        """Get the optimizer, or None for plain gradient descent."""
+        return self._optimizer
+
+    @optimizer.setter
+    def optimizer(self, optimizer):
+        """Set the optimizer, or None for plain gradient descent."""
+        self._optimizer = optimizer
+
+    @property
+    def activations(self):
+        """Return the activation of each layer after the input layer."""
+        return self._layers.activations
+
+    def forward(self, inputs):
+        """Feed inputs through the network.
+
+        :param inputs: Values for the input layer neurodes, either one
+            sample or a 2-D batch with one sample per row.
+        :return: A list with the values of every layer, input layer
+            first and output layer last.
+        """
+        values = [np.asarray(inputs, dtype=self.dtype)]
+        for matrix, activation in zip(self.weights, self.activations):
+            values.append(activation.array(values[-1] @ matrix.T))
+        return values
+
+    def predict(self, inputs):
+        """Feed a batch through the network, keeping only the outputs.
+
+        :param inputs: 2-D array with one sample per row.
+        :return: 2-D array of output layer values, one row per sample.
+        """
+        values = np.atleast_2d(np.asarray(inputs, dtype=self.dtype))
+        for matrix, activation in zip(self.weights, self.activations):
+            values = activation.array(values @ matrix.T)
+        return values
+
+    def gradients(self, values, expected):
+        """Return the weight changes back propagation asks for.
+
+        Deltas are computed from the weights as they are now, matching
+        the order used by BPNeurode. For a batch the changes are summed
+        over its rows. Multiply by the learning rate and divide by the
+        number of rows before adding them to the weights.
+
+        :param list values: Layer values returned by forward().
+        :param expected: Expected values for the output layer.
+        :return: One change matrix per weight matrix, input side first.
+        """
+        output = values[-1]
+        activations = self.activations
+        delta = ((np.asarray(expected, dtype=self.dtype) - output)
+                 * activations[-1].array_derivative(output))
+        weights = self.weights
+        changes = [None] * len(weights)
+        for i in range(len(weights) - 1, -1, -1):
+            upstream = values[i]
+            changes[i] = np.atleast_2d(delta).T @ np.atleast_2d(upstream)
+            if i > 0:
+                # layer i is the (i - 1)th layer after the input layer
+                delta = ((delta @ weights[i])
+                         * activations[i - 1].array_derivative(upstream))
+        return changes
+
+    def apply(self, changes, count=1):
+        """Add weight changes from gradients() to every weight matrix.
+
+        :param list changes: Change matrices returned by gradients().
+        :param int count: Number of samples the changes were summed
+            over; the average change is applied (default is 1).
+        """
+        if self._optimizer is not None:
+            if count != 1:
+                changes = [change / count for change in changes]
+            self._optimizer.step(self.weights, changes, self.learning_rate)
+            return
+        rate = self.learning_rate / count
+        for matrix, change in zip(self.weights, changes):
+            matrix += rate * change
+
+    def backward(self, values, expected):
+        """Back propagate the error and update every weight matrix.
+
+        For a batch the weight changes are averaged over its rows and
+        applied once.
+
+        :param list values: Layer values returned by forward().
+        :param expected: Expected values for the output layer.
+        """
+        output = values[-1]
+        count = len(output) if output.ndim > 1 else 1
+        self.apply(self.gradients(values, expected), count)
+
+    def train_sample(self, inputs, expected):
+        """Run one forward and backward pass for a single sample.
+
+        :return: The output layer values predicted before the update.
+        """
+        values = self.forward(inputs)
+        self.backward(values, expected)
+        return values[-1]
+
+    def train_batch(self, inputs, expected):
+        """Run one forward and backward pass for a batch of samples.
+
+        :param inputs: 2-D array with one sample per row.
+        :param expected: 2-D array with the expected outputs per row.
+        :return: The output layer values predicted before the update,
+            one row per sample.
+        """
+        values = self.forward(np.atleast_2d(inputs))
+        self.backward(values, np.atleast_2d(expected))
+        return values[-1]
@@ -149,3 +149,10 @@ class DoublyLinkedList:
     def is_empty(self):
         """Return True if the list is empty, False otherwise."""
         return self.head is None
+
+    def __iter__(self):
+        """Yield the data of each node from head to tail."""
+        current = self.head
+        while current:
+            yield current.data
+            current = current.next
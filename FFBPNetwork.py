@@ -4,8 +4,18 @@ Use LayerList to create a network.
 Provide training and testing methods that take advantage of the NNData.
 """
 
+import warnings
+
+import numpy as np
+
 from LayerList import LayerList
 from FFBPNeurode import FFBPNeurode
+from Checkpoint import save_checkpoint, load_checkpoint
+from DenseEngine import DenseEngine
+from FrozenModel import FrozenModel
+from LayerScheduler import LayerScheduler
+from Metrics import Metrics
+from ParallelTrainer import ParallelTrainer
 import NNData
 from RMSE import RMSE
 
@@ -19,20 +29,40 @@ class FFBPNetwork:
         pass
 
     def __init__(self, num_inputs: int, num_outputs: int,
-                 error_model: type(RMSE)):
+                 error_model: type(RMSE), activation=None,
+                 dtype=np.float64, seed=None):
         """Set up a Neural Network with initial input and output neurodes.
 
         :param int num_inputs: Number of input layer neurodes.
         :param int num_outputs: Number of output layer neurodes.
         :param type(RMSE) error_model: Error model to use when reporting
             RMSE
+        :param Activation activation: Activation for the output layer
+            (default is None, sigmoid).
+        :param dtype: Float type of the weights and of the compiled
+            engine, np.float32 or np.float64 (default is np.float64).
+        :param seed: Seed or np.random.Generator to draw the starting
+            weights of every layer from (default is None, a fresh
+            generator).
         """
-        self.layers = LayerList(num_inputs, num_outputs, FFBPNeurode)
+        self._rng = np.random.default_rng(seed)
+        self.layers = LayerList(num_inputs, num_outputs, FFBPNeurode,
+                                activation, dtype, self._rng)
         self._num_inputs = num_inputs
         self._num_outputs = num_outputs
         self._errors = error_model()
+        self._scheduler = LayerScheduler(self.layers)
+        self._engine = DenseEngine(self.layers)
+
+    @property
+    def rng(self):
+        """Get the generator the starting weights are drawn from.
 
-    def add_hidden_layer(self, num_nodes, position=0):
+        Use rng.spawn() to give worker processes independent streams.
+        """
+        return self._rng
+
+    def add_hidden_layer(self, num_nodes, position=0, activation=None):
         """Add a hidden layer to the network.
 
         :param int num_nodes: Number of neurodes to populate in the new
@@ -40,14 +70,57 @@ class FFBPNetwork:
         :param int position: Location to insert layer, with 0 indicating
             that the new layer should be the first hidden layer, etc.
             (default is 0).
+        :param Activation activation: Activation for the new layer, such
+            as Activation.ReLU() (default is None, sigmoid).
         """
         self.layers.reset_to_head()
         for _ in range(position):
             self.layers.move_forward()
-        self.layers.add_layer(num_nodes)
+        self.layers.add_layer(num_nodes, activation)
+
+    def _train_sample(self, x, y, engine=None):
+        """Train on one sample and return the predicted values."""
+        if engine is not None:
+            return list(engine.train_sample(x, y))
+        return self._scheduler.train_sample(x, y)
+
+    def _predict_sample(self, x, engine=None):
+        """Feed one sample forward and return the predicted values."""
+        if engine is not None:
+            return list(engine.forward(x)[-1])
+        return self._scheduler.forward(x)
+
+    def predict(self, features):
+        """Predict the outputs for many samples in one vectorized pass.
+
+        No neurode values, deltas or weights are changed, so predict()
+        is safe to call between or during training runs.
+
+        :param features: 2-D array-like with one sample per row.
+        :return: 2-D array of predicted outputs, one row per sample.
+        """
+        features = np.atleast_2d(np.asarray(features,
+                                            dtype=self.layers.dtype))
+        if features.shape[1] != self._num_inputs:
+            raise ValueError(f"Expected {self._num_inputs} features per "
+                             f"sample, got {features.shape[1]}.")
+        return self._engine.predict(features)
+
+    def export(self, path):
+        """Save the trained weights for use by a FrozenModel.
+
+        The file only holds the layer sizes, activations and weights, so
+        FrozenModel.load() can predict without building any neurodes.
+
+        :param path: File name or open binary file to write to.
+        """
+        FrozenModel.save(path, self.layers.weight_matrices,
+                         self.layers.activations)
 
     def train(self, data_set: NNData, epochs=1000,
-              verbosity=2, order=NNData.Order.SHUFFLE):
+              verbosity=2, order=NNData.Order.SHUFFLE, compiled=False,
+              batch_size=None, checkpoint=None, checkpoint_every=100,
+              optimizer=None, patience=None, min_delta=0.0):
         """Train the network for a number of epochs.
 
         :param NNData data_set: An NNData object with a dataset loaded.
@@ -58,47 +131,259 @@ class FFBPNetwork:
             (default is 2).
         :param NNData.Order order: Whether to shuffle examples prior
             to training each epoch (default is NNData.Order.SHUFFLE).
+        :param bool compiled: Run on a DenseEngine instead of passing
+            messages between neurodes (default is False).
+        :param int batch_size: Train on batches of this many examples,
+            averaging the weight changes over each batch and applying
+            them once. Batches always run compiled (default is None,
+            one example at a time).
+        :param checkpoint: File name to write a checkpoint to, which
+            resume() can continue from (default is None, no checkpoints).
+        :param int checkpoint_every: Write a checkpoint after every this
+            many epochs (default is 100).
+        :param Optimizer optimizer: Optimizer to apply the weight
+            changes with, such as Optimizer.Adam(). Its state is kept in
+            arrays next to the weight matrices, so training runs
+            compiled (default is None, plain gradient descent).
+        :param int patience: Stop early once the validation RMSE has
+            not improved for this many epochs, and go back to the
+            weights with the best validation RMSE. The data set needs a
+            validation set (default is None, train every epoch).
+        :param float min_delta: Smallest drop in validation RMSE that
+            counts as an improvement (default is 0.0).
+        :return: The RMSE of the final epoch.
         """
         if data_set.number_of_samples(NNData.Set.TRAIN) == 0:
             raise FFBPNetwork.EmptySetException
-        for epoch in range(0, epochs):
+        if (patience is not None
+                and data_set.number_of_samples(NNData.Set.VALIDATION) == 0):
+            raise FFBPNetwork.EmptySetException
+        options = {
+            "epochs": epochs,
+            "order": order,
+            "compiled": (compiled or batch_size is not None
+                         or optimizer is not None),
+            "batch_size": batch_size,
+            "checkpoint": checkpoint,
+            "checkpoint_every": checkpoint_every,
+            "optimizer": optimizer,
+            "patience": patience,
+            "min_delta": min_delta,
+        }
+        return self._train(data_set, 0, verbosity, options)
+
+    def resume(self, checkpoint, data_set: NNData, verbosity=2):
+        """Continue a training run from its last checkpoint.
+
+        The weights, learning rate, optimizer state, early stopping
+        progress, random state and data set split and pools are restored
+        first, so the run carries on exactly as if it had never stopped.
+        A checkpoint from before networks had their own generator gives
+        a warning, as its random state cannot be restored.
+
+        :param checkpoint: File name of a checkpoint written by train().
+        :param NNData data_set: The same data set the run trained on.
+        :param int verbosity: How much information to display, as in
+            train() (default is 2).
+        :return: The RMSE of the final epoch.
+        """
+        state = load_checkpoint(checkpoint)
+        matrices = self.layers.weight_matrices
+        if [m.shape for m in matrices] != [m.shape for m in state["weights"]]:
+            raise ValueError("Checkpoint is for a different network shape.")
+        for matrix, saved in zip(matrices, state["weights"]):
+            matrix[...] = saved
+        self.layers.input_nodes[0].learning_rate = state["learning_rate"]
+        # checkpoints from before networks had their own generator hold
+        # the random module's state instead, which cannot be restored
+        if isinstance(state.get("random_state"), dict):
+            self._rng.bit_generator.state = state["random_state"]
+        else:
+            warnings.warn("Checkpoint has no network random state, so the "
+                          "network keeps its current generator.",
+                          stacklevel=2)
+        data_set.load_state(state["data_state"])
+        options = dict(state["options"], checkpoint=checkpoint)
+        return self._train(data_set, state["epoch"], verbosity, options,
+                           state.get("stopping"))
+
+    def _save_checkpoint(self, data_set: NNData, epoch, options, stopping):
+        """Write everything needed to resume at the given epoch."""
+        state = {
+            "epoch": epoch,
+            "weights": self.layers.weight_matrices,
+            "learning_rate": self.layers.input_nodes[0].learning_rate,
+            "random_state": self._rng.bit_generator.state,
+            "data_state": data_set.save_state(),
+            "options": options,
+            "stopping": stopping,
+        }
+        save_checkpoint(options["checkpoint"], state)
+
+    def _score(self, data_set: NNData, target_set, batch_size=4096):
+        """Find the error on a whole set without training.
+
+        Like evaluate(), the set is predicted batch_size samples at a
+        time, so a large or memory-mapped set is never gathered whole.
+        """
+        indices = data_set.indices(target_set)
+        errors = type(self._errors)()
+        for start in range(0, len(indices), batch_size):
+            batch = indices[start:start + batch_size]
+            errors.add_batch(self._engine.predict(data_set.features[batch]),
+                             data_set.labels[batch])
+        return errors
+
+    def _should_stop(self, data_set: NNData, stopping, options):
+        """Track the best validation RMSE, True once patience runs out."""
+        error = self._score(data_set, NNData.Set.VALIDATION).error
+        if error < stopping["best_error"] - options["min_delta"]:
+            stopping["best_error"] = error
+            stopping["best_weights"] = [
+                matrix.copy() for matrix in self.layers.weight_matrices]
+            stopping["waited"] = 0
+            return False
+        stopping["waited"] += 1
+        return stopping["waited"] >= options["patience"]
+
+    def _train(self, data_set: NNData, first_epoch, verbosity, options,
+               stopping=None):
+        """Run the training epochs from first_epoch on."""
+        batch_size = options["batch_size"]
+        order = options["order"]
+        engine = self._engine if options["compiled"] else None
+        self._engine.optimizer = options.get("optimizer")
+        if options.get("patience") is not None and stopping is None:
+            stopping = {"best_error": float("inf"), "best_weights": None,
+                        "waited": 0}
+        for epoch in range(first_epoch, options["epochs"]):
             self._errors.reset()
-            data_set.prime_data(order=order)
-            while not data_set.pool_is_empty(NNData.Set.TRAIN):
-                x, y = data_set.get_one_item(NNData.Set.TRAIN)
-                zipped = zip(x, self.layers.input_nodes)
-                for val, node in zipped:
-                    node.set_input(val)
-                predicted = []
-                zipped = zip(y, self.layers.output_nodes)
-                for val, node in zipped:
-                    node.set_expected(val)
-                    predicted.append(node.value)
-                self._errors += (y, predicted)
+            if batch_size is None:
+                data_set.prime_data(order=order)
+                items = iter(
+                    lambda: data_set.get_one_item(NNData.Set.TRAIN), None)
+            else:
+                items = data_set.iter_batches(NNData.Set.TRAIN, batch_size,
+                                              order)
+            for x, y in items:
+                if batch_size is None:
+                    predicted = self._train_sample(x, y, engine)
+                    self._errors += (y, predicted)
+                    batch = [(x, y, predicted)]
+                else:
+                    predicted = engine.train_batch(x, y)
+                    self._errors.add_batch(predicted, y)
+                    batch = zip(x, y, predicted)
                 if epoch % 1000 == 0 and verbosity > 1:
-                    print("Sample", x, "expected", y, "predicted", predicted)
+                    for x, y, predicted in batch:
+                        print("Sample", x, "expected", y,
+                              "predicted", list(predicted))
             if epoch % 100 == 0 and verbosity > 0:
                 print(f"Epoch {epoch} RMSE = {self._errors.error}")
+            if (stopping is not None
+                    and self._should_stop(data_set, stopping, options)):
+                if verbosity > 0:
+                    print(f"Stopping early after epoch {epoch}")
+                break
+            if (options["checkpoint"] is not None
+                    and (epoch + 1) % options["checkpoint_every"] == 0):
+                self._save_checkpoint(data_set, epoch + 1, options, stopping)
+        restored = (stopping is not None
+                    and stopping["best_weights"] is not None)
+        if restored:
+            for matrix, best in zip(self.layers.weight_matrices,
+                                    stopping["best_weights"]):
+                matrix[...] = best
+            # the last epoch's RMSE was for weights we just threw away
+            self._errors = self._score(data_set, NNData.Set.TRAIN)
         print(f"Final Training RMSE = {self._errors.error}")
+        if restored:
+            print(f"Best Validation RMSE = {stopping['best_error']}")
+        return self._errors.error
+
+    def train_parallel(self, data_set: NNData, epochs=1000, verbosity=2,
+                       order=NNData.Order.SHUFFLE, batch_size=32,
+                       workers=None, mode="sync"):
+        """Train the network with a pool of worker processes.
+
+        The weights and data are shared with the workers, which each
+        train on a shard of the training set. In "sync" mode every
+        worker takes batch_size samples per step and their weight
+        changes are averaged, so the result matches batch training with
+        a batch size of workers * batch_size. In "hogwild" mode each
+        worker trains on its own shard and updates the shared weights
+        without locking.
+
+        :param NNData data_set: An NNData object with a dataset loaded.
+        :param int epochs: Number of epochs to train (default is 1000).
+        :param int verbosity: 0=only final RMSE, >0 RMSE every 100
+            epochs (default is 2).
+        :param NNData.Order order: Whether to shuffle examples prior
+            to training each epoch (default is NNData.Order.SHUFFLE).
+        :param int batch_size: Samples per worker per weight update
+            (default is 32).
+        :param int workers: Number of worker processes (default is None,
+            one per CPU).
+        :param str mode: "sync" or "hogwild" (default is "sync").
+        :return: The RMSE of the final epoch.
+        """
+        if data_set.number_of_samples(NNData.Set.TRAIN) == 0:
+            raise FFBPNetwork.EmptySetException
+        with ParallelTrainer(self.layers, data_set, workers, mode) as trainer:
+            for epoch in range(0, epochs):
+                self._errors.reset()
+                indices = data_set.indices(NNData.Set.TRAIN, order)
+                self._errors += trainer.run_epoch(indices, batch_size,
+                                                  type(self._errors))
+                if epoch % 100 == 0 and verbosity > 0:
+                    print(f"Epoch {epoch} RMSE = {self._errors.error}")
+        print(f"Final Training RMSE = {self._errors.error}")
+        return self._errors.error
+
+    def evaluate(self, data_set: NNData, target_set=NNData.Set.TEST,
+                 classify=False, threshold=0.5, batch_size=4096):
+        """Score the network on a whole set in one vectorized pass.
+
+        :param NNData data_set: An NNData object with a dataset loaded.
+        :param NNData.Set target_set: Which set to score (default is
+            NNData.Set.TEST).
+        :param bool classify: Also build a confusion matrix and find the
+            accuracy (default is False).
+        :param float threshold: Class cut off for a single output
+            (default is 0.5).
+        :param int batch_size: Samples to predict at a time, which bounds
+            the memory used (default is 4096).
+        :return: A Metrics object with per-output RMSE, MAE and max
+            error.
+        """
+        indices = data_set.indices(target_set)
+        if not len(indices):
+            raise FFBPNetwork.EmptySetException
+        metrics = Metrics(classify, threshold)
+        for start in range(0, len(indices), batch_size):
+            batch = indices[start:start + batch_size]
+            metrics.add_batch(self.predict(data_set.features[batch]),
+                              data_set.labels[batch])
+        return metrics
 
-    def test(self, data_set: NNData, order=NNData.Order.STATIC):
+    def test(self, data_set: NNData, order=NNData.Order.STATIC,
+             compiled=False):
         """Test the network.
 
         :param NNData data_set: An NNData object with a dataset loaded.
         :param NNData.Order order: Whether to shuffle examples prior
             to testing (default is NNData.Order.STATIC).
+        :param bool compiled: Run on a DenseEngine instead of passing
+            messages between neurodes (default is False).
         """
         if data_set.number_of_samples(NNData.Set.TEST) == 0:
             raise FFBPNetwork.EmptySetException
+        engine = self._engine if compiled else None
         self._errors.reset()
         data_set.prime_data(order=order)
         while not data_set.pool_is_empty(NNData.Set.TEST):
             x, y = data_set.get_one_item(NNData.Set.TEST)
-            for j, node in enumerate(self.layers.input_nodes):
-                node.set_input(x[j])
-            predicted = []
-            for j, node in enumerate(self.layers.output_nodes):
-                predicted.append(node.value)
+            predicted = self._predict_sample(x, engine)
             self._errors += (y, predicted)
             print(f"{x}, {y}, {predicted}")
         print("RMSE = ", self._errors.error)
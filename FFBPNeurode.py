@@ -9,4 +9,4 @@ from BPNeurode import BPNeurode
 class FFBPNeurode(FFNeurode, BPNeurode):
     """FFNeurode first for method order."""
 
-    pass
+    __slots__ = ()
@@ -7,17 +7,18 @@ nodes in the upstream and downstream manner.
 
 from __future__ import annotations  # needed for type hints
 from Neurode import Neurode
-import math  # for exp function
+from Activation import SIGMOID
 
 
 class FFNeurode(Neurode):
     """Feed forward neurode class that inherits from base Neurode."""
 
+    __slots__ = ()
+
     @staticmethod
     def _sigmoid(value):
         # does the sigmoid calculation
-        result = 1 / (1 + math.exp(-value))
-        return result
+        return SIGMOID.value(value)
 
     def _calculate_value(self):
         # calculate the weighted sum and put through sigmoid
@@ -29,8 +30,8 @@ class FFNeurode(Neurode):
             curr_val = curr_node.value
             total += curr_val * curr_weight
 
-        # set node value using sigmoid
-        self._value = self._sigmoid(total)
+        # set node value using the activation (sigmoid by default)
+        self._value = self._activation.value(total)
 
     def _fire_downstream(self):
         # tell downstream nodes we have data
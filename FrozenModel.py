@@ -0,0 +1,106 @@
+"""
+Frozen inference model loaded from an exported FFBPNetwork.
+
+A frozen model only holds the weight matrices, so loading one does not
+build any neurodes or wire any connections.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from Activation import SIGMOID, get_activation
+
+FORMAT_VERSION = 2  # version 1 files have no activations, all sigmoid
+
+
+class FrozenModel:
+    """Predict with the exported weights of a trained network."""
+
+    def __init__(self, weights, activations=None):
+        """Set up a model from its weight matrices.
+
+        :param list weights: One matrix per layer pair, input side
+            first, shaped (downstream neurodes, upstream neurodes).
+            Float32 weights are kept as float32 and the model predicts
+            in float32; anything else is converted to float64.
+        :param list activations: Activation of each layer after the
+            input layer (default is None, all sigmoid).
+        """
+        self._weights = [np.asarray(matrix) for matrix in weights]
+        if self._weights[0].dtype not in (np.float32, np.float64):
+            self._weights = [matrix.astype(np.float64)
+                             for matrix in self._weights]
+        if activations is None:
+            activations = [SIGMOID] * len(self._weights)
+        self._activations = list(activations)
+
+    @staticmethod
+    def save(path, weights, activations=None):
+        """Write weight matrices to a compact binary file.
+
+        :param path: File name or open binary file to write to.
+        :param list weights: One matrix per layer pair, input side first.
+        :param list activations: Activation of each layer after the
+            input layer (default is None, all sigmoid).
+        """
+        if activations is None:
+            activations = [SIGMOID] * len(weights)
+        arrays = {f"weights_{i}": matrix for i, matrix in enumerate(weights)}
+        sizes = [weights[0].shape[1]] + [len(matrix) for matrix in weights]
+        if not hasattr(path, "write"):
+            # open the file ourselves so numpy doesn't add a .npz suffix
+            with open(path, "wb") as file:
+                FrozenModel.save(file, weights, activations)
+            return
+        names = [activation.name for activation in activations]
+        params = [np.nan if activation.param is None else activation.param
+                  for activation in activations]
+        np.savez(path, format_version=FORMAT_VERSION, layer_sizes=sizes,
+                 activations=names, activation_params=params, **arrays)
+
+    @classmethod
+    def load(cls, path) -> FrozenModel:
+        """Load a model written by save() or FFBPNetwork.export().
+
+        :param path: File name or open binary file to read from.
+        """
+        with np.load(path, allow_pickle=False) as archive:
+            version = int(archive["format_version"])
+            if version not in (1, FORMAT_VERSION):
+                raise ValueError("Unsupported model file version.")
+            sizes = archive["layer_sizes"]
+            weights = [archive[f"weights_{i}"]
+                       for i in range(len(sizes) - 1)]
+            activations = None
+            if version > 1:
+                activations = [
+                    get_activation(str(name),
+                                   None if np.isnan(param) else param)
+                    for name, param in zip(archive["activations"],
+                                           archive["activation_params"])]
+        return cls(weights, activations)
+
+    @property
+    def dtype(self):
+        """Get the float type the weights were saved as."""
+        return self._weights[0].dtype
+
+    @property
+    def layer_sizes(self):
+        """Get the number of neurodes in each layer, input layer first."""
+        return [self._weights[0].shape[1]] + [len(m) for m in self._weights]
+
+    def predict(self, features):
+        """Predict the outputs for many samples in one vectorized pass.
+
+        :param features: 2-D array-like with one sample per row.
+        :return: 2-D array of predicted outputs, one row per sample.
+        """
+        values = np.atleast_2d(np.asarray(features, dtype=self.dtype))
+        if values.shape[1] != self.layer_sizes[0]:
+            raise ValueError(f"Expected {self.layer_sizes[0]} features per "
+                             f"sample, got {values.shape[1]}.")
+        for matrix, activation in zip(self._weights, self._activations):
+            values = activation.array(values @ matrix.T)
+        return values
@@ -6,25 +6,44 @@ to manage organization and connections.
 between layers of neurodes.
 """
 
+import numpy as np
+
+from Activation import SIGMOID
 from DoublyLinkedList import DoublyLinkedList
-from Neurode import MultiLinkNode
+from Neurode import MultiLinkNode, NeighborGroup
 
 
 class LayerList(DoublyLinkedList):
     """Class for managing layers of neurodes in a neural network."""
 
-    def __init__(self, inputs: int, outputs: int, neurode_type):
-        """Initialize the network with input and output layers."""
+    def __init__(self, inputs: int, outputs: int, neurode_type,
+                 activation=None, dtype=np.float64, rng=None):
+        """Initialize the network with input and output layers.
+
+        :param int inputs: Number of input layer neurodes.
+        :param int outputs: Number of output layer neurodes.
+        :param neurode_type: Class of neurode to fill the layers with.
+        :param Activation activation: Activation for the output layer
+            (default is None, sigmoid).
+        :param dtype: Float type of the weight matrices, np.float32 or
+            np.float64 (default is np.float64).
+        :param rng: Seed or np.random.Generator to draw the starting
+            weights from (default is None, a fresh generator).
+        """
         super().__init__()
+        self._dtype = np.dtype(dtype)
+        if self._dtype not in (np.float32, np.float64):
+            raise ValueError("dtype must be np.float32 or np.float64.")
+        self._rng = np.random.default_rng(rng)
         self._neurode_type = neurode_type
+        # weight matrix for each layer, keyed by id of the layer's list
+        self._matrices = {}
 
         input_layer = []
         for _ in range(inputs):
             input_layer.append(neurode_type())
 
-        output_layer = []
-        for _ in range(outputs):
-            output_layer.append(neurode_type())
+        output_layer = self._new_layer(outputs, activation)
 
         self._connect_layers(input_layer, output_layer)
         self.add_to_head(input_layer)
@@ -33,26 +52,60 @@ class LayerList(DoublyLinkedList):
     def _connect_layers(self, layer1, layer2):
         """Connect each node in layer1 to each node in layer2."""
         side = MultiLinkNode.Side
+        # one group per layer is shared by every node connecting to it
+        group1 = NeighborGroup(layer1)
+        group2 = NeighborGroup(layer2)
+        # random float 0 to 1, drawn from this network's own stream
+        matrix = self._rng.random((len(layer2), len(layer1)),
+                                  dtype=self._dtype)
         for node1 in layer1:
-            node1.reset_neighbors(layer2, side.DOWNSTREAM)
-        for node2 in layer2:
-            node2.reset_neighbors(layer1, side.UPSTREAM)
+            node1.reset_neighbors(group2, side.DOWNSTREAM)
+        # row j is the weight storage of neurode j of layer2, filled
+        # already, so no neurode draws its own weights
+        for node2, row in zip(layer2, matrix):
+            node2.reset_neighbors(group1, side.UPSTREAM, row)
+        self._matrices[id(layer2)] = matrix
+
+    def _share_weights(self, layer1, layer2):
+        """Move the weights between layer1 and layer2 into one matrix.
+
+        Row j of the matrix is a view that neurode j of layer2 keeps its
+        weights in, so the neurodes and the matrix never need a sync.
+        """
+        matrix = np.empty((len(layer2), len(layer1)), dtype=self._dtype)
+        for row, node in zip(matrix, layer2):
+            node._weights.bind(row)
+        self._matrices[id(layer2)] = matrix
 
     def _disconnect_layers(self, layer1, layer2):
         """Remove all connections between layer1 and layer2."""
+        side = MultiLinkNode.Side
         for node in layer1:
-            node.reset_neighbors([], True)
+            node.reset_neighbors([], side.DOWNSTREAM)
         for node in layer2:
-            node.reset_neighbors([], False)
+            node.reset_neighbors([], side.UPSTREAM)
 
-    def add_layer(self, num_nodes: int):
-        """Add a hidden layer after the current position."""
+    def _new_layer(self, num_nodes: int, activation=None):
+        """Create a layer of neurodes that all use one activation."""
+        new_nodes = []
+        for _ in range(num_nodes):
+            node = self._neurode_type()
+            if activation is not None:
+                node.activation = activation
+            new_nodes.append(node)
+        return new_nodes
+
+    def add_layer(self, num_nodes: int, activation=None):
+        """Add a hidden layer after the current position.
+
+        :param int num_nodes: Number of neurodes in the new layer.
+        :param Activation activation: Activation for the new layer
+            (default is None, sigmoid).
+        """
         if self._curr.next is None:
             raise IndexError("Cannot add layer after output layer")
 
-        new_nodes = []
-        for _ in range(num_nodes):
-            new_nodes.append(self._neurode_type())
+        new_nodes = self._new_layer(num_nodes, activation)
 
         current_layer = self._curr.data
         next_layer = self._curr.next.data
@@ -75,9 +128,43 @@ class LayerList(DoublyLinkedList):
         self._disconnect_layers(layer_before, goner)
         self._disconnect_layers(goner, layer_after)
         self._connect_layers(layer_before, layer_after)
+        del self._matrices[id(goner)]
 
         self.remove_after_current()
 
+    def __setstate__(self, state):
+        """Restore a copy, sharing its weights again.
+
+        Copying or unpickling turns each row view into its own array,
+        so the matrices are rebuilt from the copied neurodes.
+        """
+        self.__dict__.update(state)
+        self._matrices = {}
+        layers = list(self)
+        for layer1, layer2 in zip(layers, layers[1:]):
+            self._share_weights(layer1, layer2)
+
+    @property
+    def weight_matrices(self):
+        """Return the weight matrix of each layer after the input layer.
+
+        A matrix has one row per neurode in the layer and one column
+        per neurode in the layer before it. The rows are the neurodes'
+        own weights, so changes made either way are seen by both.
+        """
+        return [self._matrices[id(layer)] for layer in list(self)[1:]]
+
+    @property
+    def dtype(self):
+        """Get the float type of the weight matrices."""
+        return self._dtype
+
+    @property
+    def activations(self):
+        """Return the activation of each layer after the input layer."""
+        return [layer[0].activation if layer else SIGMOID
+                for layer in list(self)[1:]]
+
     @property
     def input_nodes(self):
         """Return the input layer neurodes."""
@@ -0,0 +1,63 @@
+"""
+Iterative scheduler for running a LayerList one layer at a time.
+
+The neurodes normally pass messages recursively: the last input's
+set_input drives the whole network on the call stack. The scheduler
+instead works through a queue of layers in topological order, so the
+stack depth no longer grows with the number of layers.
+"""
+
+from collections import deque
+
+
+class LayerScheduler:
+    """Run feed forward and back propagation over a LayerList by layer."""
+
+    def __init__(self, layers):
+        """Schedule the neurodes of a LayerList.
+
+        :param LayerList layers: The layers of neurodes to run.
+        """
+        self._layers = layers
+
+    def forward(self, inputs):
+        """Feed inputs through the network, input layer first.
+
+        :param inputs: Values for the input layer neurodes.
+        :return: A list of the output layer values.
+        """
+        queue = deque(self._layers)
+        for value, node in zip(inputs, queue.popleft()):
+            # set the value without firing downstream, the queue does that
+            node._value = value
+        while queue:
+            for node in queue.popleft():
+                node._calculate_value()
+        return [node.value for node in self._layers.output_nodes]
+
+    def backward(self, expected):
+        """Back propagate the error, output layer first.
+
+        Each layer calculates all of its deltas before it updates the
+        weights of the layer after it, the same order BPNeurode uses.
+
+        :param expected: Expected values for the output layer neurodes.
+        """
+        queue = deque(self._layers)
+        for value, node in zip(expected, queue.pop()):
+            node._calculate_delta(value)
+        while queue:
+            layer = queue.pop()
+            for node in layer:
+                node._calculate_delta()
+            for node in layer:
+                node._update_weights()
+
+    def train_sample(self, inputs, expected):
+        """Run one forward and backward pass for a single sample.
+
+        :return: The output layer values predicted before the update.
+        """
+        predicted = self.forward(inputs)
+        self.backward(expected)
+        return predicted
@@ -0,0 +1,214 @@
+"""
+Streaming evaluation metrics for networks with one or more outputs.
+
+Like RMSE, Metrics keeps only running totals, here one per output, so
+scoring any number of samples takes memory proportional to the number
+of outputs. A single pass gives per-output RMSE, MAE and max error and,
+for classifiers, a confusion matrix and accuracy.
+"""
+
+import numpy as np
+
+
+class Metrics:
+    """Accumulate per-output error metrics one batch at a time.
+
+    For classification, a sample's class is the index of its largest
+    output, or for a single output whether it is at least threshold.
+    """
+
+    __slots__ = ("_classify", "_threshold", "_count", "_abs_sum",
+                 "_squared_sum", "_max_error", "_confusion")
+
+    def __init__(self, classify=False, threshold=0.5):
+        """Start with no samples counted.
+
+        :param bool classify: Also build a confusion matrix (default is
+            False).
+        :param float threshold: Cut off between class 0 and class 1 for
+            networks with a single output (default is 0.5).
+        """
+        self._classify = classify
+        self._threshold = threshold
+        self.reset()
+
+    def reset(self):
+        """Start over with no samples counted."""
+        self._count = 0
+        self._abs_sum = None
+        self._squared_sum = None
+        self._max_error = None
+        self._confusion = None
+
+    def _start(self, outputs):
+        """Set up the running totals for a number of outputs."""
+        self._abs_sum = np.zeros(outputs)
+        self._squared_sum = np.zeros(outputs)
+        self._max_error = np.zeros(outputs)
+        if self._classify:
+            classes = 2 if outputs == 1 else outputs
+            self._confusion = np.zeros((classes, classes), dtype=np.int64)
+
+    def _classes(self, values):
+        """Find the class of each row of outputs."""
+        if values.shape[1] == 1:
+            return (values[:, 0] >= self._threshold).astype(np.intp)
+        return values.argmax(axis=1)
+
+    def add_batch(self, predicted, expected):
+        """Add many predicted and expected samples in one pass.
+
+        A 1-D array is taken as a single sample, and an empty batch adds
+        nothing.
+
+        :param predicted: 2-D array with one sample's outputs per row.
+        :param expected: 2-D array with one sample's labels per row.
+        :return: This instance, so calls can be chained.
+        """
+        predicted = np.asarray(predicted, dtype=float)
+        expected = np.asarray(expected, dtype=float)
+        if predicted.shape != expected.shape:
+            raise ValueError("Points must have same dimensions")
+        if not predicted.size:
+            return self
+        if predicted.ndim < 2:
+            predicted = predicted.reshape(1, -1)
+            expected = expected.reshape(1, -1)
+        if self._abs_sum is None:
+            self._start(predicted.shape[1])
+        elif predicted.shape[1] != len(self._abs_sum):
+            raise ValueError(f"Expected {len(self._abs_sum)} outputs per "
+                             f"sample, got {predicted.shape[1]}.")
+        errors = np.abs(predicted - expected)
+        self._abs_sum += errors.sum(axis=0)
+        self._squared_sum += np.einsum("ij,ij->j", errors, errors)
+        np.maximum(self._max_error, errors.max(axis=0, initial=0),
+                   out=self._max_error)
+        if self._confusion is not None:
+            np.add.at(self._confusion,
+                      (self._classes(expected), self._classes(predicted)), 1)
+        self._count += len(errors)
+        return self
+
+    def __add__(self, points):
+        """Add one sample, or merge in Metrics, and return new instance."""
+        new_obj = Metrics()
+        new_obj.load_state(self.save_state())
+        new_obj += points
+        return new_obj
+
+    def __iadd__(self, points):
+        """Add one predicted and expected sample, or merge in Metrics."""
+        if isinstance(points, Metrics):
+            return self.merge(points)
+        predicted, expected = points
+        return self.add_batch([predicted], [expected])
+
+    def merge(self, other):
+        """Merge in the samples counted by another Metrics.
+
+        :param Metrics other: Metrics with the same settings.
+        :return: This instance, so calls can be chained.
+        """
+        if (other._classify, other._threshold) != \
+                (self._classify, self._threshold):
+            raise ValueError("Cannot merge Metrics with different settings.")
+        if other._abs_sum is None:
+            return self
+        if self._abs_sum is None:
+            self._start(len(other._abs_sum))
+        elif len(other._abs_sum) != len(self._abs_sum):
+            raise ValueError("Cannot merge Metrics for different outputs.")
+        self._count += other._count
+        self._abs_sum += other._abs_sum
+        self._squared_sum += other._squared_sum
+        np.maximum(self._max_error, other._max_error, out=self._max_error)
+        if self._confusion is not None:
+            self._confusion += other._confusion
+        return self
+
+    def save_state(self):
+        """Return the running totals, to send to another process.
+
+        :return: A dict that load_state() accepts.
+        """
+        state = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if isinstance(value, np.ndarray):
+                value = value.copy()
+            state[name.lstrip("_")] = value
+        return state
+
+    def load_state(self, state):
+        """Replace the settings and totals with ones from save_state().
+
+        :param state: A dict returned by save_state().
+        """
+        for name in self.__slots__:
+            setattr(self, name, state[name.lstrip("_")])
+
+    @property
+    def count(self):
+        """Get the number of samples added so far."""
+        return self._count
+
+    @property
+    def rmse(self):
+        """Get the root mean squared error of each output."""
+        if not self._count:
+            return np.zeros(0)
+        return np.sqrt(self._squared_sum / self._count)
+
+    @property
+    def mae(self):
+        """Get the mean absolute error of each output."""
+        if not self._count:
+            return np.zeros(0)
+        return self._abs_sum / self._count
+
+    @property
+    def max_error(self):
+        """Get the largest absolute error seen for each output."""
+        if not self._count:
+            return np.zeros(0)
+        return self._max_error.copy()
+
+    @property
+    def confusion_matrix(self):
+        """Get sample counts by expected class (row) and predicted class.
+
+        None unless the Metrics were set up to classify.
+        """
+        if self._confusion is None:
+            return None
+        return self._confusion.copy()
+
+    @property
+    def accuracy(self):
+        """Get the fraction of samples put in the right class.
+
+        None unless the Metrics were set up to classify.
+        """
+        if not self._classify:
+            return None
+        if not self._count:
+            return 0
+        return np.trace(self._confusion) / self._count
+
+    def report(self):
+        """Lay out every metric as a text table, one row per output."""
+        lines = [f"{'output':>6}  {'RMSE':>10}  {'MAE':>10}  "
+                 f"{'max error':>10}"]
+        for output, values in enumerate(zip(self.rmse, self.mae,
+                                            self.max_error)):
+            lines.append(f"{output:>6}  " + "  ".join(f"{value:>10.6f}"
+                                                      for value in values))
+        if self._classify:
+            lines.append(f"accuracy = {self.accuracy}")
+            lines.append("confusion matrix (rows expected, columns "
+                         "predicted):")
+            if self._confusion is not None:
+                lines.extend("  " + " ".join(f"{count:>6}" for count in row)
+                             for row in self._confusion)
+        return "\n".join(lines)
@@ -1,11 +1,131 @@
 """This module contains the NNData class for managing neural network data."""
 
 from enum import Enum
-from collections import deque
-import random
+import copy
+from itertools import islice
 import numpy as np
 
 
+def map_arrays(features_path, labels_path, dtype=None, feature_columns=None,
+               label_columns=None):
+    """
+    Open feature and label files as read-only memory-mapped arrays.
+
+    Files ending in .npy are opened with np.load, taking their shape and
+    dtype from the file header. Any other file is read as raw binary of
+    dtype, one sample per row of the given number of columns.
+
+    :param features_path: Feature file, .npy or raw binary.
+    :param labels_path: Label file, .npy or raw binary.
+    :param dtype: Float type of raw binary files, which .npy files must
+                  also match if given (default is None, np.float64 for
+                  raw binary files).
+    :param feature_columns: Features per sample in a raw binary file.
+    :param label_columns: Labels per sample in a raw binary file.
+    :return: A tuple of the 2-D feature and label arrays.
+    """
+    features = _map_array(features_path, dtype, feature_columns)
+    labels = _map_array(labels_path, dtype, label_columns)
+    if features.dtype != labels.dtype:
+        raise ValueError("Feature and label files must have the same dtype.")
+    return features, labels
+
+
+def _map_array(path, dtype, columns):
+    """Memory-map one .npy or raw binary file as a 2-D array."""
+    if str(path).endswith(".npy"):
+        array = np.load(path, mmap_mode="r")
+        if dtype is not None and array.dtype != np.dtype(dtype):
+            raise ValueError(f"{path} holds {array.dtype}, not "
+                             f"{np.dtype(dtype)}.")
+    else:
+        if columns is None:
+            raise ValueError("Raw binary files need a column count.")
+        array = np.memmap(path, dtype=dtype or np.float64, mode="r")
+        if array.size % columns:
+            raise ValueError(f"{path} does not hold whole rows of "
+                             f"{columns} values.")
+        array = array.reshape(-1, columns)
+    if array.ndim == 1:
+        array = array.reshape(-1, 1)
+    return array
+
+
+def read_delimited(path, label_columns, feature_columns=None, delimiter=",",
+                   skip_rows=0, chunk_rows=8192, dtype=np.float64):
+    """
+    Read a delimited text file into feature and label arrays in chunks.
+
+    The file is scanned once to count its lines, then parsed chunk_rows
+    lines at a time straight into preallocated arrays, so peak memory
+    stays near the size of the arrays themselves. Blank lines are
+    skipped.
+
+    :param path: Name of the text file, such as a CSV.
+    :param label_columns: Index, or list of distinct indexes, of the
+                          label columns. Negative indexes count from
+                          the end.
+    :param feature_columns: List of indexes of the feature columns
+                            (default is None, every other column).
+    :param delimiter: String between columns (default is ",").
+    :param skip_rows: Header lines to skip (default is 0).
+    :param chunk_rows: Lines to parse at a time (default is 8192).
+    :param dtype: Float type of the arrays (default is np.float64).
+    :return: A tuple of the 2-D feature and label arrays.
+    """
+    if isinstance(label_columns, int):
+        label_columns = [label_columns]
+    with open(path, "rb") as file:
+        lines, last = 0, b"\n"
+        for block in iter(lambda: file.read(1 << 20), b""):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        lines += 1  # the last line has no newline
+    rows = max(lines - skip_rows, 0)
+
+    features = labels = None
+    filled = 0
+    with open(path) as file:
+        data_lines = islice(file, skip_rows, None)
+        while chunk := list(islice(data_lines, chunk_rows)):
+            if not any(line.strip() for line in chunk):
+                continue
+            values = np.loadtxt(chunk, delimiter=delimiter, dtype=dtype,
+                                ndmin=2)
+            del chunk
+            if features is None:
+                columns = values.shape[1]
+                if not all(-columns <= c < columns for c in label_columns):
+                    raise ValueError(f"Label columns {label_columns} are "
+                                     f"out of range for {columns} columns.")
+                label_columns = [c % columns for c in label_columns]
+                if len(set(label_columns)) != len(label_columns):
+                    raise ValueError("Label columns must not repeat.")
+                if feature_columns is None:
+                    feature_columns = [c for c in range(columns)
+                                       if c not in label_columns]
+                features = np.empty((rows, len(feature_columns)), dtype)
+                labels = np.empty((rows, len(label_columns)), dtype)
+            end = filled + len(values)
+            np.take(values, feature_columns, axis=1, out=features[filled:end])
+            np.take(values, label_columns, axis=1, out=labels[filled:end])
+            filled = end
+    if features is None:
+        raise ValueError(f"{path} holds no rows of data.")
+    return features[:filled], labels[:filled]
+
+
+def _no_indices():
+    """Return an empty index array."""
+    return np.empty(0, dtype=np.intp)
+
+
+def _as_indices(indices):
+    """Return indices as a new index array."""
+    return np.array(indices, dtype=np.intp)
+
+
 class Order(Enum):
     """Enum for specifying the order of data."""
 
@@ -20,11 +140,19 @@ class Set(Enum):
 
     TRAIN = 0
     TEST = 1
+    VALIDATION = 2
 
 
 class NNData:
     """A class for managing neural network training and testing data."""
 
+    _dtype = np.dtype(np.float64)  # default until __init__ sets one
+    _source = None  # arguments to map_arrays() for file-backed data
+    _stratify = False  # split each class in the same proportions
+    _rng = np.random.default_rng()  # until __init__ gives us our own
+    # position of the next unused index in each pool
+    _train_cursor = _test_cursor = _validation_cursor = 0
+
     @staticmethod
     def percentage_limiter(percentage: float) -> float:
         """
@@ -35,34 +163,165 @@ class NNData:
         """
         return max(0.0, min(1.0, percentage))
 
-    def __init__(self, features=None, labels=None, train_factor=0.9):
+    def __init__(self, features=None, labels=None, train_factor=0.9,
+                 dtype=np.float64, validation_factor=0.0, stratify=False,
+                 seed=None):
         """
         Initialize the NNData object.
 
         :param features: List of lists containing feature data.
         :param labels: List of lists containing label data.
         :param train_factor: Percentage of data to use for training.
+        :param dtype: Float type to store features and labels as,
+                      np.float32 or np.float64 (default is np.float64).
+        :param validation_factor: Percentage of the training data to
+                                  hold out for validation (default is 0).
+        :param stratify: Split each class of label in the same
+                         proportions (default is False).
+        :param seed: Seed or np.random.Generator for splitting and
+                     shuffling (default is None, a fresh generator).
         """
+        self._dtype = np.dtype(dtype)
+        if self._dtype not in (np.float32, np.float64):
+            raise ValueError("dtype must be np.float32 or np.float64.")
         self._features = None
         self._labels = None
         self._train_factor = NNData.percentage_limiter(train_factor)
-        self._train_indices = []
-        self._test_indices = []
-        self._train_pool = deque()
-        self._test_pool = deque()
+        self._validation_factor = NNData.percentage_limiter(
+            validation_factor)
+        self._stratify = stratify
+        self._rng = np.random.default_rng(seed)
+        self._train_indices = _no_indices()
+        self._test_indices = _no_indices()
+        self._validation_indices = _no_indices()
+        for pool_set in Set:
+            self._set_pool(pool_set, _no_indices())
 
         if features is not None and labels is not None:
             self.load_data(features, labels)
         else:
             self.load_data()
 
+    @classmethod
+    def from_arrays(cls, features, labels, train_factor=0.9,
+                    validation_factor=0.0, seed=None):
+        """
+        Create an NNData that uses the given arrays without copying them.
+
+        Unlike the constructor, which copies its data, this keeps the
+        arrays as they are, such as arrays mapped from files or held in
+        shared memory. The data set takes the feature array's dtype.
+
+        :param features: 2-D float32 or float64 array of features.
+        :param labels: 2-D array of labels, converted to the features'
+                       dtype if it differs.
+        :param train_factor: Percentage of data to use for training.
+        :param validation_factor: Percentage of the training data to
+                                  hold out for validation (default is 0).
+        :param seed: Seed or np.random.Generator for splitting and
+                     shuffling (default is None, a fresh generator).
+        :return: A new NNData object.
+        """
+        features = np.asarray(features)
+        data = cls(None, None, train_factor, features.dtype,
+                   validation_factor, seed=seed)
+        if len(features) != len(labels):
+            raise ValueError("Features and labels must have the same length.")
+        data._features = features
+        data._labels = np.asarray(labels, dtype=data._dtype)
+        data.split_set()
+        return data
+
+    @classmethod
+    def from_files(cls, features_path, labels_path, train_factor=0.9,
+                   validation_factor=0.0, dtype=None, feature_columns=None,
+                   label_columns=None, seed=None):
+        """
+        Create an NNData backed by memory-mapped feature and label files.
+
+        Nothing is read into memory up front: samples and batches are
+        read from the mapping as they are asked for, and processes that
+        map the same files share the operating system's page cache.
+        The arrays take their dtype from the files.
+
+        :param features_path: Feature file, .npy or raw binary.
+        :param labels_path: Label file, .npy or raw binary.
+        :param train_factor: Percentage of data to use for training.
+        :param validation_factor: Percentage of the training data to
+                                  hold out for validation (default is 0).
+        :param dtype: Float type of raw binary files (default is None,
+                      np.float64 for raw binary files).
+        :param feature_columns: Features per sample in a raw binary file.
+        :param label_columns: Labels per sample in a raw binary file.
+        :param seed: Seed or np.random.Generator for splitting and
+                     shuffling (default is None, a fresh generator).
+        :return: A new NNData object.
+        """
+        source = {"features_path": str(features_path),
+                  "labels_path": str(labels_path), "dtype": dtype,
+                  "feature_columns": feature_columns,
+                  "label_columns": label_columns}
+        features, labels = map_arrays(**source)
+        data = cls.from_arrays(features, labels, train_factor,
+                               validation_factor, seed)
+        data._source = source
+        return data
+
+    @classmethod
+    def from_csv(cls, path, label_columns, train_factor=0.9,
+                 validation_factor=0.0, dtype=np.float64, seed=None,
+                 **options):
+        """
+        Create an NNData from a delimited text file, read in chunks.
+
+        :param path: Name of the text file, such as a CSV.
+        :param label_columns: Index, or list of indexes, of the label
+                              columns. Negative indexes count from the end.
+        :param train_factor: Percentage of data to use for training.
+        :param validation_factor: Percentage of the training data to
+                                  hold out for validation (default is 0).
+        :param dtype: Float type to store features and labels as,
+                      np.float32 or np.float64 (default is np.float64).
+        :param seed: Seed or np.random.Generator for splitting and
+                     shuffling (default is None, a fresh generator).
+        :param options: feature_columns, delimiter, skip_rows and
+                        chunk_rows, as for read_delimited().
+        :return: A new NNData object.
+        """
+        features, labels = read_delimited(path, label_columns, dtype=dtype,
+                                          **options)
+        return cls.from_arrays(features, labels, train_factor,
+                               validation_factor, seed)
+
+    @property
+    def source(self):
+        """Get the map_arrays() arguments of a file-backed data set.
+
+        None if the data was loaded into memory.
+        """
+        return self._source
+
+    def __getstate__(self):
+        """Pickle a file-backed data set as its file names, not its data."""
+        state = self.__dict__.copy()
+        if self._source is not None:
+            state["_features"] = state["_labels"] = None
+        return state
+
+    def __setstate__(self, state):
+        """Map the files again when unpickling a file-backed data set."""
+        self.__dict__.update(state)
+        if self._source is not None:
+            self._features, self._labels = map_arrays(**self._source)
+
     def load_data(self, features=None, labels=None):
         """
         Load features and labels into the object and prepares them for use.
 
-        :param features: List of lists containing feature data.
-        :param labels: List of lists containing label data.
+        :param features: List of lists or array containing feature data.
+        :param labels: List of lists or array containing label data.
         """
+        self._source = None
         if features is None or labels is None:
             self._features = None
             self._labels = None
@@ -76,8 +335,8 @@ class NNData:
             raise ValueError("Features and labels must have the same length.")
 
         try:
-            self._features = np.array(features, dtype=float)
-            self._labels = np.array(labels, dtype=float)
+            self._features = np.array(features, dtype=self._dtype)
+            self._labels = np.array(labels, dtype=self._dtype)
         except ValueError:
             self._features = None
             self._labels = None
@@ -87,75 +346,385 @@ class NNData:
 
         self.split_set()
 
-    def split_set(self, new_train_factor=None):
+    def split_set(self, new_train_factor=None, new_validation_factor=None,
+                  stratify=None):
         """
         Split the data into training/testing sets based on the train_factor.
 
+        The validation set, if any, is then held out from the training
+        set based on the validation_factor.
+
         :param new_train_factor: Optional new training factor to use.
+        :param new_validation_factor: Optional new validation factor to
+                                      use.
+        :param stratify: Optional new choice of whether to split each
+                         class of label in the same proportions.
         """
+        settings = self._train_factor, self._validation_factor, \
+            self._stratify
         if new_train_factor is not None:
             self._train_factor = self.percentage_limiter(new_train_factor)
+        if new_validation_factor is not None:
+            self._validation_factor = self.percentage_limiter(
+                new_validation_factor)
+        if stratify is not None:
+            self._stratify = stratify
 
         if self._features is None or self._labels is None:
-            self._train_indices = []
-            self._test_indices = []
+            self._train_indices = _no_indices()
+            self._test_indices = _no_indices()
+            self._validation_indices = _no_indices()
             return
 
-        num_samples = len(self._features)
-        num_train = int(num_samples * self._train_factor)
-        all_indices = list(range(num_samples))
-        random.shuffle(all_indices)
-        self._train_indices = all_indices[:num_train]
-        self._test_indices = all_indices[num_train:]
+        all_indices = self._rng.permutation(len(self._features))
+        try:
+            train, test = self._split(all_indices, self._train_factor)
+            validation, train = self._split(train, self._validation_factor)
+        except ValueError:
+            # a refused split leaves the current one and its settings
+            self._train_factor, self._validation_factor, \
+                self._stratify = settings
+            raise
+        self._train_indices = train
+        self._test_indices = test
+        self._validation_indices = validation
+
+    def _split(self, indices, factor):
+        """
+        Split shuffled indices in two, the first part int(len * factor).
+
+        When stratifying, each class gets the same share of its samples
+        in the first part, as near as whole samples allow.
+        """
+        if not self._stratify or not len(indices):
+            count = int(len(indices) * factor)
+            return indices[:count], indices[count:]
+        first, second = [], []
+        taken = seen = 0
+        for group in self._classes(indices):
+            # share out by running totals so the parts add up exactly
+            seen += len(group)
+            count = int(seen * factor) - taken
+            taken += count
+            first.append(group[:count])
+            second.append(group[count:])
+        return (self._shuffled(np.concatenate(first)),
+                self._shuffled(np.concatenate(second)))
+
+    def _classes(self, indices):
+        """
+        Group indices by class of label, keeping their order in a class.
+
+        A single label column must hold whole numbers, each its own
+        class; with several columns the class is the index of the
+        largest label.
+
+        :return: A list of index arrays, one per class.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        labels = self._labels[indices]
+        if labels.shape[1] == 1:
+            if not np.array_equal(labels, np.round(labels)):
+                raise ValueError("Stratifying needs whole number class "
+                                 "labels, not continuous values.")
+            classes = np.unique(labels[:, 0], return_inverse=True)[1]
+        else:
+            classes = labels.argmax(axis=1)
+        order = np.argsort(classes, kind="stable")
+        bounds = np.flatnonzero(np.diff(classes[order])) + 1
+        return np.split(indices[order], bounds)
+
+    def folds(self, k, stratify=None):
+        """
+        Yield k views of the data set for k-fold cross-validation.
+
+        Every sample is in the test set of exactly one fold. Each view is
+        an NNData sharing this one's features and labels, not a copy,
+        with its own index arrays, pools and child random stream, so it
+        can be passed straight to FFBPNetwork.train() and test(). The
+        validation_factor is held out of each fold's training set.
+
+        :param k: Number of folds, from 2 up to the number of samples.
+        :param stratify: Whether to spread each class of label evenly
+                         across the folds (default is None, as the data
+                         set was split).
+        :return: An iterator of k NNData objects.
+        """
+        num_samples = 0 if self._features is None else len(self._features)
+        if not 2 <= k <= num_samples:
+            raise ValueError("Need from 2 folds up to one per sample.")
+        if stratify is None:
+            stratify = self._stratify
+        indices = self._rng.permutation(num_samples)
+        if stratify:
+            indices = np.concatenate(self._classes(indices))
+        # dealing in turn spreads each class evenly over the folds
+        fold_of = np.arange(num_samples) % k
+        for fold, rng in enumerate(self._rng.spawn(k)):
+            view = copy.copy(self)
+            view._stratify = stratify
+            view._rng = rng
+            view._test_indices = self._shuffled(indices[fold_of == fold])
+            view._validation_indices, view._train_indices = view._split(
+                self._shuffled(indices[fold_of != fold]),
+                self._validation_factor)
+            for pool_set in Set:
+                view._set_pool(pool_set, _no_indices())
+            yield view
+
+    def _shuffled(self, indices):
+        """Return a shuffled index array, in one vectorized permutation."""
+        return self._rng.permutation(np.asarray(indices, dtype=np.intp))
+
+    def _indices_for(self, target_set):
+        """Return the index array of a set, TRAIN if target_set is None."""
+        if target_set == Set.TEST:
+            return self._test_indices
+        if target_set == Set.VALIDATION:
+            return self._validation_indices
+        return self._train_indices
+
+    def _pool_for(self, target_set):
+        """Return the pool array and cursor of a set, TRAIN if None."""
+        if target_set == Set.TEST:
+            return self._test_pool, self._test_cursor
+        if target_set == Set.VALIDATION:
+            return self._validation_pool, self._validation_cursor
+        return self._train_pool, self._train_cursor
+
+    def _set_cursor(self, target_set, cursor):
+        """Move the cursor of a set's pool, TRAIN if None."""
+        if target_set == Set.TEST:
+            self._test_cursor = cursor
+        elif target_set == Set.VALIDATION:
+            self._validation_cursor = cursor
+        else:
+            self._train_cursor = cursor
+
+    def _set_pool(self, target_set, pool):
+        """Replace the pool of a set, with its cursor at the start."""
+        if target_set == Set.TEST:
+            self._test_pool = pool
+        elif target_set == Set.VALIDATION:
+            self._validation_pool = pool
+        else:
+            self._train_pool = pool
+        self._set_cursor(target_set, 0)
+
+    def _take(self, target_set, count):
+        """Return up to count indices from a pool and move past them."""
+        pool, cursor = self._pool_for(target_set)
+        taken = pool[cursor:cursor + count]
+        self._set_cursor(target_set, cursor + len(taken))
+        return taken
 
     def prime_data(self, target_set=None, order=None):
         """
         Prepare the data for use by loading one or both pools.
 
-        :param target_set: Which set to prime (Train, Test, or Both).
+        A pool is an array of indices with a cursor that moves past each
+        one as it is used, so priming never builds Python objects.
+
+        :param target_set: Which set to prime (Train, Test, Validation,
+                           or all of them).
         :param order: Whether to shuffle the data.
         """
-        if target_set is None or target_set == Set.TRAIN:
-            self._train_pool = deque(self._train_indices)
-            if order in (Order.RANDOM, Order.SHUFFLE):
-                random.shuffle(self._train_pool)
-
-        if target_set is None or target_set == Set.TEST:
-            self._test_pool = deque(self._test_indices)
-            if order in (Order.RANDOM, Order.SHUFFLE):
-                random.shuffle(self._test_pool)
+        shuffle = order in (Order.RANDOM, Order.SHUFFLE)
+        for pool_set in Set:
+            if target_set is None or target_set == pool_set:
+                indices = self._indices_for(pool_set)
+                self._set_pool(pool_set,
+                               self._shuffled(indices) if shuffle
+                               else np.asarray(indices, dtype=np.intp))
 
     def get_one_item(self, target_set=None):
         """
         Return a single item (feature and label) from the specified set.
 
-        :param target_set: Which set to get the item from (Train or Test).
+        :param target_set: Which set to get the item from (Train, Test
+                           or Validation).
         :return: A tuple containing a feature and its corresponding label,
                  or None if the pool is empty.
         """
-        if target_set is None:
-            target_set = Set.TRAIN
-
-        pool = self._train_pool if target_set == Set.TRAIN else self._test_pool
+        pool, cursor = self._pool_for(target_set)
 
-        if not pool:
+        if cursor >= len(pool):
             return None
 
-        index = pool.popleft()
+        self._set_cursor(target_set, cursor + 1)
+        index = pool[cursor]
         return self._features[index], self._labels[index]
 
+    def get_batch(self, target_set=None, batch_size=1):
+        """
+        Return up to batch_size items from the specified set at once.
+
+        :param target_set: Which set to get the items from (Train, Test
+                           or Validation).
+        :param batch_size: The largest number of items to return.
+        :return: A tuple of a 2-D feature array and a 2-D label array,
+                 one row per item, or None if the pool is empty.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+        indices = self._take(target_set, batch_size)
+
+        if not len(indices):
+            return None
+
+        return (self._features.take(indices, axis=0),
+                self._labels.take(indices, axis=0))
+
+    def iter_batches(self, target_set=None, batch_size=1, order=None,
+                     contiguous=False):
+        """
+        Prime a set and yield all of its items in batches.
+
+        The set's pool is primed in the given order and used up at once,
+        and each batch is gathered with a single take on the arrays
+        rather than one lookup per item. With contiguous, the whole set
+        is gathered in pool order once instead, and every batch is a
+        slice of that copy. This costs one copy of the set but makes
+        each batch a contiguous view.
+
+        :param target_set: Which set to get the items from (Train, Test
+                           or Validation).
+        :param batch_size: The largest number of items in a batch.
+        :param order: Whether to shuffle the data.
+        :param contiguous: Reorder the set once so batches are slices
+                           (default is False).
+        :return: An iterator of tuples of a 2-D feature array and a 2-D
+                 label array, one row per item.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+        self.prime_data(target_set or Set.TRAIN, order)
+        pool, cursor = self._pool_for(target_set)
+        indices = pool[cursor:]
+        self._set_cursor(target_set, len(pool))
+        features, labels = self._features, self._labels
+        if contiguous:
+            features = features.take(indices, axis=0)
+            labels = labels.take(indices, axis=0)
+            for start in range(0, len(indices), batch_size):
+                yield (features[start:start + batch_size],
+                       labels[start:start + batch_size])
+            return
+        for start in range(0, len(indices), batch_size):
+            batch = indices[start:start + batch_size]
+            yield features.take(batch, axis=0), labels.take(batch, axis=0)
+
+    @property
+    def features(self):
+        """Get the array of features, one row per sample."""
+        return self._features
+
+    @property
+    def labels(self):
+        """Get the array of labels, one row per sample."""
+        return self._labels
+
+    @property
+    def dtype(self):
+        """Get the float type the features and labels are stored as."""
+        return self._dtype
+
+    @property
+    def rng(self):
+        """Get the generator that splits and shuffles the data.
+
+        Use rng.spawn() to give worker processes independent streams.
+        """
+        return self._rng
+
+    def reseed(self, seed=None):
+        """
+        Replace the generator that splits and shuffles the data.
+
+        The current split is kept; call split_set() to redo it.
+
+        :param seed: Seed or np.random.Generator (default is None, a
+                     fresh generator).
+        """
+        self._rng = np.random.default_rng(seed)
+
+    def indices(self, target_set=None, order=None):
+        """
+        Return the indices of the samples in the specified set.
+
+        :param target_set: Which set to return (Train, Test or
+                           Validation).
+        :param order: Whether to shuffle the indices, as prime_data()
+                      would.
+        :return: A new array of row indices into features and labels.
+        """
+        if order in (Order.RANDOM, Order.SHUFFLE):
+            return self._shuffled(self._indices_for(target_set))
+        return _as_indices(self._indices_for(target_set))
+
     def number_of_samples(self, target_set=None):
         """
         Return the number of samples in the specified set(s).
 
-        :param target_set: Which set to count (Train, Test, or Both).
+        :param target_set: Which set to count (Train, Test, Validation,
+                           or all of them).
         :return: The number of samples in the specified set(s).
         """
-        if target_set == Set.TRAIN:
-            return len(self._train_indices)
-        if target_set == Set.TEST:
-            return len(self._test_indices)
-        return len(self._train_indices) + len(self._test_indices)
+        if target_set is not None:
+            return len(self._indices_for(target_set))
+        return (len(self._train_indices) + len(self._test_indices)
+                + len(self._validation_indices))
+
+    def save_state(self):
+        """
+        Return the split and pool state needed to resume from a checkpoint.
+
+        The features and labels themselves are not included.
+
+        :return: A dict that load_state() accepts.
+        """
+        return {
+            "train_factor": self._train_factor,
+            "validation_factor": self._validation_factor,
+            "stratify": self._stratify,
+            "random_state": self._rng.bit_generator.state,
+            "number_of_samples": self.number_of_samples(),
+            "train_indices": self._train_indices.copy(),
+            "test_indices": self._test_indices.copy(),
+            "validation_indices": self._validation_indices.copy(),
+            # only the indices the cursors have not passed yet
+            "train_pool": self._train_pool[self._train_cursor:].copy(),
+            "test_pool": self._test_pool[self._test_cursor:].copy(),
+            "validation_pool":
+                self._validation_pool[self._validation_cursor:].copy(),
+        }
+
+    def load_state(self, state):
+        """
+        Restore the split and pools saved by save_state().
+
+        :param state: A dict returned by save_state().
+        """
+        if state["number_of_samples"] != self.number_of_samples():
+            raise ValueError("Saved state is for a different data set.")
+        self._train_factor = state["train_factor"]
+        # states saved before validation sets existed have none
+        self._validation_factor = state.get("validation_factor", 0.0)
+        self._stratify = state.get("stratify", False)
+        if "random_state" in state:
+            # restore into a new generator, as this one may be shared
+            rng = np.random.Generator(type(self._rng.bit_generator)())
+            rng.bit_generator.state = state["random_state"]
+            self._rng = rng
+        # older states hold lists, which convert the same way
+        self._train_indices = _as_indices(state["train_indices"])
+        self._test_indices = _as_indices(state["test_indices"])
+        self._validation_indices = _as_indices(
+            state.get("validation_indices", []))
+        self._set_pool(Set.TRAIN, _as_indices(state["train_pool"]))
+        self._set_pool(Set.TEST, _as_indices(state["test_pool"]))
+        self._set_pool(Set.VALIDATION,
+                       _as_indices(state.get("validation_pool", [])))
 
     def pool_is_empty(self, target_set=None):
         """
@@ -164,8 +733,5 @@ class NNData:
         :param target_set: Which set to check.
         :return: True if the pool is empty, False otherwise.
         """
-        if target_set is None:
-            target_set = Set.TRAIN
-
-        return len(self._train_pool if target_set == Set.TRAIN
-                   else self._test_pool) == 0
+        pool, cursor = self._pool_for(target_set)
+        return cursor >= len(pool)
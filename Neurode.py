@@ -1,13 +1,102 @@
 """Neural Network Node Implementation."""
 from __future__ import annotations
+from collections.abc import Mapping
 from enum import Enum
-import random
-from typing import Dict, List
+from typing import Dict
+
+import numpy as np
+
+from Activation import SIGMOID, Activation
+
+
+class NeighborGroup(tuple):
+    """Fixed group of neighbors, each with a precomputed slot.
+
+    A layer passes one group to all of its neurodes, so the slots are
+    stored once per layer instead of once per neurode.
+    """
+
+    def __new__(cls, nodes=()):
+        """Build the group and give each node a slot (its bit position)."""
+        group = super().__new__(cls, nodes)
+        group.positions = {node: i for i, node in enumerate(group)}
+        group.reference_value = (1 << len(group)) - 1
+        return group
+
+    @classmethod
+    def of(cls, nodes) -> NeighborGroup:
+        """Return nodes as a group, reusing it if it already is one."""
+        return nodes if isinstance(nodes, cls) else cls(nodes)
+
+
+_NO_NEIGHBORS = NeighborGroup()  # shared, since groups never change
+
+
+class WeightMap(Mapping):
+    """Upstream weights held in one contiguous array indexed by slot.
+
+    Looks up like a dict keyed by neighbor, but there is no entry or
+    boxed float per connection, only one array element.
+    """
+
+    __slots__ = ("_positions", "_array")
+
+    def __init__(self, positions: Dict[object, int], storage=None):
+        """Set up weights for the nodes in positions.
+
+        :param positions: Slot of each upstream node.
+        :param storage: Optional float array, one element per upstream
+            node, to keep the weights in as they are (default is None,
+            a new zeroed array).
+        """
+        self._positions = positions
+        self._array = np.zeros(len(positions)) if storage is None \
+            else storage
+
+    def __getitem__(self, node) -> float:
+        """Get the weight for a given upstream node."""
+        return self._array.item(self._positions[node])
+
+    def __setitem__(self, node, weight: float) -> None:
+        """Set the weight for a given upstream node."""
+        self._array[self._positions[node]] = weight
+
+    def __iter__(self):
+        """Iterate over the upstream nodes in slot order."""
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        """Count the upstream nodes."""
+        return len(self._positions)
+
+    def __repr__(self) -> str:
+        """Show the weights like a dict would."""
+        return repr(dict(self.items()))
+
+    @property
+    def array(self) -> np.ndarray:
+        """Get the weights as one array in slot order."""
+        return self._array
+
+    def bind(self, storage: np.ndarray) -> None:
+        """Move the weights into storage and keep them there from now on.
+
+        :param storage: A float array with one element per upstream node,
+            such as a row view of a layer's weight matrix.
+        """
+        storage[:] = self._array
+        self._array = storage
 
 
 class MultiLinkNode:
     """Base class for neural network nodes. Tracks node reports with binary."""
 
+    # report and reference bits live in one slot per side rather than
+    # in dicts keyed by side, which cost two dicts per neurode
+    __slots__ = ("_upstream_reports", "_downstream_reports",
+                 "_upstream_reference", "_downstream_reference",
+                 "_neighbors")
+
     class Side(Enum):
         """Defines which side nodes connect to."""
 
@@ -15,25 +104,33 @@ class MultiLinkNode:
         DOWNSTREAM = 2  # nodes feeding out
 
     def __init__(self):
-        """Initialize tracking dictionaries and neighbor lists."""
+        """Initialize report tracking and neighbor lists."""
         # track which nodes reported in (using binary)
-        self._reporting_nodes = {
-            self.Side.UPSTREAM: 0,
-            self.Side.DOWNSTREAM: 0
-        }
+        self._upstream_reports = 0
+        self._downstream_reports = 0
 
         # what binary number we expect when all nodes report in
-        self._reference_value = {
-            self.Side.UPSTREAM: 0,
-            self.Side.DOWNSTREAM: 0
-        }
+        self._upstream_reference = 0
+        self._downstream_reference = 0
 
-        # lists of nodes we're connected to
-        self._neighbors: Dict[MultiLinkNode.Side, List[MultiLinkNode]] = {
-            self.Side.UPSTREAM: [],
-            self.Side.DOWNSTREAM: []
+        # groups of nodes we're connected to, with each node's slot
+        self._neighbors: Dict[MultiLinkNode.Side, NeighborGroup] = {
+            self.Side.UPSTREAM: _NO_NEIGHBORS,
+            self.Side.DOWNSTREAM: _NO_NEIGHBORS
         }
 
+    @property
+    def _reporting_nodes(self) -> Dict[MultiLinkNode.Side, int]:
+        """Get the bits of the nodes that reported in, keyed by side."""
+        return {self.Side.UPSTREAM: self._upstream_reports,
+                self.Side.DOWNSTREAM: self._downstream_reports}
+
+    @property
+    def _reference_value(self) -> Dict[MultiLinkNode.Side, int]:
+        """Get the bits expected once every node reports, keyed by side."""
+        return {self.Side.UPSTREAM: self._upstream_reference,
+                self.Side.DOWNSTREAM: self._downstream_reference}
+
     def __str__(self) -> str:
         """Show the node's connections."""
         ups = self._neighbors[self.Side.UPSTREAM]
@@ -53,31 +150,44 @@ class MultiLinkNode:
 
     def reset_neighbors(self, nodes: list, side: MultiLinkNode.Side) -> None:
         """Reset and setup new neighbor connections."""
-        # copy the list so changes won't mess us up
-        self._neighbors[side] = nodes.copy()
-
-        # each node gets a binary position (like 1, 2, 4, 8...)
-        # add them up to get expected value when all report in
-        ref_val = 0
-        for i in range(len(nodes)):
-            ref_val += 2**i
-        self._reference_value[side] = ref_val
+        group = self._set_neighbors(nodes, side)
 
         # setup each connection
-        for node in nodes:
+        for node in group:
             self._process_new_neighbor(node, side)
 
+    def _set_neighbors(self, nodes: list,
+                       side: MultiLinkNode.Side) -> NeighborGroup:
+        """Store the neighbors of one side and return them as a group."""
+        # the group is immutable, so changes to nodes won't mess us up
+        group = NeighborGroup.of(nodes)
+        self._neighbors[side] = group
+
+        # each node gets a binary position (like 1, 2, 4, 8...)
+        # all of them set is the expected value when all report in
+        if side == self.Side.UPSTREAM:
+            self._upstream_reference = group.reference_value
+        else:
+            self._downstream_reference = group.reference_value
+        return group
+
 
 class Neurode(MultiLinkNode):
     """Node for neural network. Has weights for upstream connections."""
 
+    __slots__ = ("_value", "_weights", "_activation")
+
     _learning_rate = 0.05  # same rate for all nodes
+    # draws weights for nodes connected on their own, one at a time;
+    # a LayerList passes in weights from its network's generator instead
+    _rng = np.random.default_rng()
 
     def __init__(self):
         """Setups new node with zero value and empty weights."""
         super().__init__()
         self._value = 0  # node's current value
         self._weights = {}  # store weights for upstream nodes
+        self._activation = SIGMOID  # squashes the weighted sum
 
     @property
     def learning_rate(self) -> float:
@@ -94,12 +204,54 @@ class Neurode(MultiLinkNode):
         """Get node's current value."""
         return self._value
 
+    @property
+    def activation(self) -> Activation:
+        """Get the activation function applied to the weighted sum."""
+        return self._activation
+
+    @activation.setter
+    def activation(self, activation: Activation) -> None:
+        """Set the activation function applied to the weighted sum."""
+        self._activation = activation
+
+    @classmethod
+    def reseed(cls, seed=None) -> None:
+        """Replace the generator that draws weights for new neighbors.
+
+        Only neurodes connected with reset_neighbors() and no weights
+        draw from it, and all of them share it. A LayerList draws its
+        weights from its own generator instead.
+
+        :param seed: Seed or np.random.Generator (default is None, a
+            fresh generator).
+        """
+        Neurode._rng = np.random.default_rng(seed)
+
+    def reset_neighbors(self, nodes: list, side: MultiLinkNode.Side,
+                        weights: np.ndarray = None) -> None:
+        """Reset neighbors, keeping upstream weights in one array.
+
+        :param nodes: The new neighbors.
+        :param side: Which side they connect to.
+        :param weights: Optional float array of starting weights for
+            upstream neighbors, one per node, kept as the weight storage
+            (default is None, a random weight drawn for each node).
+        """
+        if side == self.Side.UPSTREAM:
+            nodes = NeighborGroup.of(nodes)
+            self._weights = WeightMap(nodes.positions, weights)
+            if weights is not None:
+                # the weights are given, so there is nothing to draw
+                self._set_neighbors(nodes, side)
+                return
+        super().reset_neighbors(nodes, side)
+
     def _process_new_neighbor(
             self, node: Neurode, side: MultiLinkNode.Side
     ) -> None:
         """Give random weight to new upstream neighbors."""
         if side == self.Side.UPSTREAM:
-            self._weights[node] = random.random()  # random float 0 to 1
+            self._weights[node] = self._rng.random()  # random float 0 to 1
 
     def get_weight(self, node: Neurode) -> float:
         """Get the weight for a given upstream node."""
@@ -107,15 +259,20 @@ class Neurode(MultiLinkNode):
 
     def _check_in(self, node: Neurode, side: MultiLinkNode.Side) -> bool:
         """Track which nodes have reported in using binary math."""
-        # find node's position in list
-        node_pos = self._neighbors[side].index(node)
-
-        # use bit shift to mark this node as reported
-        self._reporting_nodes[side] |= (1 << node_pos)
+        # look up node's slot instead of searching the list
+        node_pos = self._neighbors[side].positions[node]
 
-        # all reported in if we match reference
-        if self._reporting_nodes[side] == self._reference_value[side]:
-            self._reporting_nodes[side] = 0  # reset for next round
-            return True
+        # use bit shift to mark this node as reported, and all have
+        # reported in if we match reference
+        if side == self.Side.UPSTREAM:
+            self._upstream_reports |= (1 << node_pos)
+            if self._upstream_reports == self._upstream_reference:
+                self._upstream_reports = 0  # reset for next round
+                return True
+        else:
+            self._downstream_reports |= (1 << node_pos)
+            if self._downstream_reports == self._downstream_reference:
+                self._downstream_reports = 0  # reset for next round
+                return True
 
         return False
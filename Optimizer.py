@@ -0,0 +1,212 @@
+"""
+Optimizers that turn back propagation's weight changes into updates.
+
+An optimizer works on the weight matrices of a LayerList, keeping any
+per-weight state (velocities, running averages) in arrays with the same
+shape and dtype as the matrix they belong to. The changes it is given
+point downhill, so every optimizer adds its update to the weights.
+"""
+
+from abc import ABC, abstractmethod
+import math
+
+import numpy as np
+
+
+class Optimizer(ABC):
+    """Parent class defines how an optimizer should work."""
+
+    name = None  # used to build the optimizer by name
+    state_names = ()  # per-weight arrays kept next to each matrix
+
+    def __init__(self, learning_rate=None):
+        """Set up an optimizer with no state yet.
+
+        :param float learning_rate: Step size to use (default is None,
+            the learning rate shared by the neurodes).
+        """
+        self._learning_rate = learning_rate
+        self._state = []
+        self._shapes = []
+        self._steps = 0
+
+    @property
+    def learning_rate(self):
+        """Get the optimizer's own step size, or None if it has none."""
+        return self._learning_rate
+
+    @property
+    def steps(self) -> int:
+        """Get the number of updates made since the state was reset."""
+        return self._steps
+
+    @property
+    def state(self):
+        """Get the per-weight state arrays, one dict per matrix."""
+        return self._state
+
+    def reset(self) -> None:
+        """Forget all per-weight state."""
+        self._state = []
+        self._shapes = []
+        self._steps = 0
+
+    def step(self, weights, changes, learning_rate=None) -> None:
+        """Update every weight matrix in place.
+
+        The state is reset first if the matrices are not the ones it
+        was built for, such as after a layer is added.
+
+        :param list weights: Weight matrices, input side first.
+        :param list changes: Average weight change for each matrix,
+            as back propagation asks for it.
+        :param float learning_rate: Step size to use when the optimizer
+            has none of its own.
+        """
+        rate = (learning_rate if self._learning_rate is None
+                else self._learning_rate)
+        shapes = [(matrix.shape, matrix.dtype) for matrix in weights]
+        if shapes != self._shapes:
+            self._state = [{name: np.zeros_like(matrix)
+                            for name in self.state_names}
+                           for matrix in weights]
+            self._shapes = shapes
+            self._steps = 0
+        self._steps += 1
+        for matrix, change, state in zip(weights, changes, self._state):
+            self._update(matrix, change, state, rate)
+
+    @abstractmethod
+    def _update(self, matrix, change, state, rate) -> None:
+        """Add the update for one matrix to it in place."""
+        pass
+
+    def __repr__(self) -> str:
+        """Show the optimizer with its learning rate."""
+        return f"{self.__class__.__name__}({self._learning_rate!r})"
+
+
+class SGD(Optimizer):
+    """Stochastic gradient descent with optional momentum.
+
+    With momentum 0 this is the same update the neurodes make.
+    """
+
+    name = "sgd"
+
+    def __init__(self, learning_rate=None, momentum=0.0, nesterov=False):
+        """Set the momentum.
+
+        :param float learning_rate: Step size to use (default is None,
+            the learning rate shared by the neurodes).
+        :param float momentum: Fraction of the last update to carry into
+            the next one, from 0 up to 1 (default is 0.0).
+        :param bool nesterov: Look ahead along the velocity before
+            applying the change (default is False).
+        """
+        if not 0 <= momentum < 1:
+            raise ValueError("Momentum must be at least 0 and below 1.")
+        if nesterov and momentum == 0:
+            raise ValueError("Nesterov momentum needs a momentum above 0.")
+        super().__init__(learning_rate)
+        self._momentum = momentum
+        self._nesterov = nesterov
+        if momentum:
+            self.state_names = ("velocity",)
+
+    def _update(self, matrix, change, state, rate):
+        """Add rate * change, or a step along the velocity."""
+        if not self._momentum:
+            matrix += rate * change
+            return
+        velocity = state["velocity"]
+        velocity *= self._momentum
+        velocity += change
+        if self._nesterov:
+            matrix += rate * (change + self._momentum * velocity)
+        else:
+            matrix += rate * velocity
+
+
+class RMSProp(Optimizer):
+    """Scale each weight's step by its recent change magnitude."""
+
+    name = "rmsprop"
+    state_names = ("square_average",)
+
+    def __init__(self, learning_rate=None, decay=0.9, epsilon=1e-8):
+        """Set the decay of the running average.
+
+        :param float learning_rate: Step size to use (default is None,
+            the learning rate shared by the neurodes).
+        :param float decay: Weight of the old average in each update of
+            the running average of squared changes (default is 0.9).
+        :param float epsilon: Guard against dividing by zero (default
+            is 1e-8).
+        """
+        if not 0 <= decay < 1:
+            raise ValueError("Decay must be at least 0 and below 1.")
+        super().__init__(learning_rate)
+        self._decay = decay
+        self._epsilon = epsilon
+
+    def _update(self, matrix, change, state, rate):
+        """Add rate * change / sqrt(average of squared changes)."""
+        square_average = state["square_average"]
+        square_average *= self._decay
+        square_average += (1 - self._decay) * change * change
+        matrix += rate * change / (np.sqrt(square_average) + self._epsilon)
+
+
+class Adam(Optimizer):
+    """Adaptive moment estimation, with bias corrected averages."""
+
+    name = "adam"
+    state_names = ("first_moment", "second_moment")
+
+    def __init__(self, learning_rate=None, beta1=0.9, beta2=0.999,
+                 epsilon=1e-8):
+        """Set the decay of the moment averages.
+
+        :param float learning_rate: Step size to use (default is None,
+            the learning rate shared by the neurodes).
+        :param float beta1: Decay of the average change (default is
+            0.9).
+        :param float beta2: Decay of the average squared change
+            (default is 0.999).
+        :param float epsilon: Guard against dividing by zero (default
+            is 1e-8).
+        """
+        if not (0 <= beta1 < 1 and 0 <= beta2 < 1):
+            raise ValueError("Betas must be at least 0 and below 1.")
+        super().__init__(learning_rate)
+        self._beta1 = beta1
+        self._beta2 = beta2
+        self._epsilon = epsilon
+
+    def _update(self, matrix, change, state, rate):
+        """Add a step along the bias corrected average change."""
+        first, second = state["first_moment"], state["second_moment"]
+        first *= self._beta1
+        first += (1 - self._beta1) * change
+        second *= self._beta2
+        second += (1 - self._beta2) * change * change
+        # fold both bias corrections into the step size
+        step = (rate * math.sqrt(1 - self._beta2 ** self._steps)
+                / (1 - self._beta1 ** self._steps))
+        matrix += step * first / (np.sqrt(second) + self._epsilon)
+
+
+OPTIMIZERS = {cls.name: cls for cls in (SGD, RMSProp, Adam)}
+
+
+def get_optimizer(name, **settings) -> Optimizer:
+    """Build an optimizer from its name.
+
+    :param str name: One of the names in OPTIMIZERS.
+    :param settings: Keyword arguments for the optimizer, such as
+        learning_rate or momentum.
+    """
+    if name not in OPTIMIZERS:
+        raise ValueError(f"Unknown optimizer {name!r}.")
+    return OPTIMIZERS[name](**settings)
@@ -0,0 +1,372 @@
+"""
+Data-parallel training of a LayerList across a pool of processes.
+
+The weight matrices and the data set are copied into shared memory once
+per run, except that a file-backed data set is mapped by each worker
+instead. Each epoch the training indices are split into shards that the
+worker processes train on, combining their work in one of two modes:
+
+* "sync": at every step each worker takes its own batch of samples and
+  writes the summed weight changes for it to its own shared buffer.
+  Once all of them have, the first worker applies their average, so a
+  step is exactly one batch of workers * batch_size samples. Each
+  worker runs the whole epoch from one task, meeting the others at a
+  barrier between steps rather than being sent every batch.
+* "hogwild": each worker trains on its own shard of the epoch and adds
+  its weight changes straight into the shared weights without locking.
+"""
+
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from DenseEngine import DenseEngine
+from NNData import map_arrays
+
+MODES = ("sync", "hogwild")
+
+# views into shared memory, set up in each worker by _attach()
+_worker = {}
+
+
+class _SharedEngine(DenseEngine):
+    """DenseEngine running on weights held in shared memory."""
+
+    def __init__(self, weights, activations, learning_rate):
+        """Run on the given matrices instead of a LayerList's."""
+        self._shared_weights = weights
+        self._optimizer = None
+        self._activations = activations
+        self._learning_rate = learning_rate
+
+    @property
+    def weights(self):
+        """Return the list of shared weight matrices, input side first."""
+        return self._shared_weights
+
+    @property
+    def activations(self):
+        """Return the activation of each layer after the input layer."""
+        return self._activations
+
+    @property
+    def dtype(self):
+        """Get the float type of the shared weights."""
+        return self._shared_weights[0].dtype
+
+    @property
+    def learning_rate(self) -> float:
+        """Get the learning rate this run was started with."""
+        return self._learning_rate
+
+
+def _views(buffer, shapes, offset=0, dtype=np.float64):
+    """Split a flat float buffer into arrays of the given shapes.
+
+    The offset is counted in elements of dtype, not in bytes.
+    """
+    itemsize = np.dtype(dtype).itemsize
+    arrays = []
+    for shape in shapes:
+        size = int(np.prod(shape))
+        arrays.append(np.ndarray(shape, dtype=dtype, buffer=buffer,
+                                 offset=offset * itemsize))
+        offset += size
+    return arrays
+
+
+def share_array(array):
+    """Copy an array of floats into a new block of shared memory.
+
+    :return: The SharedMemory block, which the caller must close and
+        unlink, and a view of the copy with the same dtype.
+    """
+    block = SharedMemory(create=True,
+                         size=max(array.size, 1) * array.dtype.itemsize)
+    view = _views(block.buf, [array.shape], dtype=array.dtype)[0]
+    view[...] = array
+    return block, view
+
+
+def attach_array(name, shape, dtype=np.float64):
+    """Map an array made by share_array() in another process.
+
+    :return: The SharedMemory block, which must be kept open while the
+        view is used, and the view.
+    """
+    block = SharedMemory(name=name)
+    return block, _views(block.buf, [shape], dtype=dtype)[0]
+
+
+def share_data(data_set):
+    """Make the features and labels of an NNData reachable by workers.
+
+    A file-backed data set is not copied: the workers map the same
+    files and share the page cache. Otherwise the arrays are copied
+    into shared memory once.
+
+    :return: A list of SharedMemory blocks, which the caller must close
+        and unlink, and a handle to pass to attach_data().
+    """
+    if data_set.source is not None:
+        return [], ("mapped", data_set.source)
+    blocks = [share_array(data_set.features)[0]]
+    try:
+        blocks.append(share_array(data_set.labels)[0])
+    except BaseException:
+        blocks[0].close()
+        blocks[0].unlink()
+        raise
+    return blocks, ("shared", [block.name for block in blocks],
+                    [data_set.features.shape, data_set.labels.shape],
+                    data_set.dtype)
+
+
+def attach_data(handle):
+    """Reach the features and labels shared by share_data().
+
+    :return: A list of SharedMemory blocks, which must be kept open
+        while the arrays are used, and the feature and label arrays.
+    """
+    if handle[0] == "mapped":
+        return [], *map_arrays(**handle[1])
+    _, names, shapes, dtype = handle
+    features_block, features = attach_array(names[0], shapes[0], dtype)
+    labels_block, labels = attach_array(names[1], shapes[1], dtype)
+    return [features_block, labels_block], features, labels
+
+
+def _attach(names, shapes, weight_dtype, data, activations, learning_rate,
+            barrier):
+    """Map the shared weights, data and change buffers in a worker."""
+    blocks = [SharedMemory(name=name) for name in names]
+    weights_block, changes_block = blocks
+    weight_shapes, workers = shapes
+    data_blocks, features, labels = attach_data(data)
+    _worker["blocks"] = blocks + data_blocks
+    _worker["engine"] = _SharedEngine(
+        _views(weights_block.buf, weight_shapes, dtype=weight_dtype),
+        activations, learning_rate)
+    _worker["features"] = features
+    _worker["labels"] = labels
+    size = sum(int(np.prod(shape)) for shape in weight_shapes)
+    _worker["changes"] = [_views(changes_block.buf, weight_shapes, i * size,
+                                 weight_dtype)
+                          for i in range(workers)]
+    _worker["barrier"] = barrier
+
+
+def _sync_epoch(task):
+    """Train on one worker's shard of every step of an epoch.
+
+    At each step the worker writes the summed weight changes for its
+    shard to its buffer and waits for the others. The first worker then
+    applies the average of all the buffers, and everyone waits again so
+    no one reads the weights while they change.
+
+    :return: The worker's error accumulator.
+    """
+    slot, steps, step_size, last, error_model = task
+    schedule = [(shard, step_size) for shard in steps]
+    if last is not None:
+        schedule.append(last)
+    engine = _worker["engine"]
+    barrier = _worker["barrier"]
+    buffers = _worker["changes"][slot]
+    errors = error_model()
+    try:
+        for shard, count in schedule:
+            if len(shard):
+                labels = _worker["labels"][shard]
+                values = engine.forward(_worker["features"][shard])
+                changes = engine.gradients(values, labels)
+                for buffer, change in zip(buffers, changes):
+                    buffer[...] = change
+                errors.add_batch(values[-1], labels)
+            else:
+                for buffer in buffers:
+                    buffer[...] = 0
+            barrier.wait()
+            if slot == 0:
+                engine.apply([sum(shard_changes) for shard_changes
+                              in zip(*_worker["changes"])], count)
+            barrier.wait()
+    except BaseException:
+        # break the barrier so the other workers fail instead of hanging
+        barrier.abort()
+        raise
+    return errors
+
+
+def _hogwild_shard(task):
+    """Train on one shard, updating the shared weights in place.
+
+    :return: The shard's error accumulator.
+    """
+    indices, batch_size, error_model = task
+    engine = _worker["engine"]
+    errors = error_model()
+    for start in range(0, len(indices), batch_size):
+        batch = indices[start:start + batch_size]
+        labels = _worker["labels"][batch]
+        errors.add_batch(
+            engine.train_batch(_worker["features"][batch], labels), labels)
+    return errors
+
+
+def _score_shard(task):
+    """Score the current weights on one shard without training."""
+    indices, error_model = task
+    predicted = _worker["engine"].predict(_worker["features"][indices])
+    return error_model().add_batch(predicted, _worker["labels"][indices])
+
+
+class ParallelTrainer:
+    """Train the weights of a LayerList with a pool of processes.
+
+    Use it as a context manager; the trained weights are copied back
+    into the LayerList and the shared memory is released on exit.
+    """
+
+    def __init__(self, layers, data_set, workers=None, mode="sync"):
+        """Set up shared memory and the process pool.
+
+        :param LayerList layers: The layers whose weights to train.
+        :param NNData data_set: An NNData object with a dataset loaded.
+        :param int workers: Number of worker processes (default is None,
+            one per CPU).
+        :param str mode: "sync" or "hogwild" (default is "sync").
+        """
+        if mode not in MODES:
+            raise ValueError(f"Mode must be one of {MODES}.")
+        self._layers = layers
+        self._mode = mode
+        self._workers = workers or multiprocessing.cpu_count()
+        matrices = layers.weight_matrices
+        shapes = [m.shape for m in matrices]
+        size = sum(m.size for m in matrices)
+        self._blocks = []
+        self._pool = None
+        try:
+            weights_block = self._share(size, layers.dtype)
+            self._share(size * self._workers, layers.dtype)
+            names = [block.name for block in self._blocks]
+            data_blocks, data = share_data(data_set)
+            self._blocks.extend(data_blocks)
+            self._weights = _views(weights_block.buf, shapes,
+                                   dtype=layers.dtype)
+            for shared, matrix in zip(self._weights, matrices):
+                shared[...] = matrix
+            self._pool = multiprocessing.Pool(
+                self._workers, _attach,
+                (names, (shapes, self._workers), layers.dtype, data,
+                 layers.activations, layers.input_nodes[0].learning_rate,
+                 multiprocessing.Barrier(self._workers)))
+        except BaseException:
+            # nothing else would unlink the blocks made so far
+            self._weights = None
+            self._release()
+            raise
+
+    def _share(self, size, dtype):
+        """Create a shared block big enough for size floats of dtype."""
+        block = SharedMemory(create=True,
+                             size=max(size, 1) * np.dtype(dtype).itemsize)
+        self._blocks.append(block)
+        return block
+
+    def __enter__(self):
+        """Start using the trainer."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Copy the trained weights back and release everything."""
+        self.close()
+
+    def close(self):
+        """Copy the trained weights back and release everything."""
+        if self._pool is None:
+            return
+        self._pool.close()
+        self._pool.join()
+        self._pool = None
+        for matrix, shared in zip(self._layers.weight_matrices,
+                                  self._weights):
+            matrix[...] = shared
+        self._weights = None
+        self._release()
+
+    def _release(self):
+        """Close and unlink every shared block."""
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def _shards(self, indices):
+        """Split indices into one non-empty shard per worker."""
+        return [shard for shard in np.array_split(indices, self._workers)
+                if len(shard)]
+
+    def run_epoch(self, indices, batch_size, error_model):
+        """Train on every sample in indices once.
+
+        The workers score the outputs they predict as they train, so
+        only their error accumulators are sent back.
+
+        :param indices: Training sample indices, in the order to use.
+        :param int batch_size: Samples per worker per weight update. In
+            sync mode each update averages one batch from every worker,
+            workers * batch_size samples in all; in hogwild mode each
+            worker makes its own batches from its shard.
+        :param error_model: RMSE subclass to score with.
+        :return: An error_model accumulator for the whole epoch.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        errors = error_model()
+        if self._mode == "sync":
+            results = self._pool.map(
+                _sync_epoch, self._sync_tasks(indices, batch_size,
+                                              error_model),
+                chunksize=1)
+        else:
+            tasks = [(shard, batch_size, error_model)
+                     for shard in self._shards(indices)]
+            results = self._pool.map(_hogwild_shard, tasks)
+        for shard_errors in results:
+            errors += shard_errors
+        return errors
+
+    def _sync_tasks(self, indices, batch_size, error_model):
+        """Give each worker its shard of every step of a sync epoch.
+
+        A step is the next workers * batch_size indices, and worker i
+        takes the i-th batch_size of them. The last step may be short,
+        so it is split as evenly as it can be and some shards may be
+        empty.
+        Every worker gets a task, as each must reach every barrier.
+        """
+        step_size = self._workers * batch_size
+        full = len(indices) // step_size * step_size
+        steps = indices[:full].reshape(-1, self._workers, batch_size)
+        rest = indices[full:]
+        lasts = np.array_split(rest, self._workers)
+        return [(slot, steps[:, slot], step_size,
+                 (lasts[slot], len(rest)) if len(rest) else None,
+                 error_model)
+                for slot in range(self._workers)]
+
+    def evaluate(self, indices, error_model):
+        """Score the current weights on samples split across the workers.
+
+        :param indices: Sample indices to score.
+        :param error_model: RMSE subclass to score with.
+        :return: An error_model accumulator for all of the samples.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        errors = error_model()
+        tasks = [(shard, error_model) for shard in self._shards(indices)]
+        for shard_errors in self._pool.map(_score_shard, tasks):
+            errors += shard_errors
+        return errors
@@ -7,37 +7,117 @@ Supports both Euclidean and Taxicab distances.
 from abc import ABC, abstractmethod
 from math import sqrt
 
+import numpy as np
+
 
 class RMSE(ABC):
-    """Parent class defines how RMSE should work."""
+    """Parent class defines how RMSE should work.
+
+    Only a running count and sum of squared distances are kept, so
+    memory use and the cost of reading error do not grow with the
+    number of points added. Accumulators of the same type can be added
+    together, in any grouping, to combine scores made in parts.
+    """
+
+    __slots__ = ("_count", "_squared_sum")
 
     def __init__(self):
-        """Create an empty list to store predicted and actual value."""
-        self._data = []
+        """Start with no points counted."""
+        self._count = 0
+        self._squared_sum = 0.0
 
     def __add__(self, points):
-        """Add predicted and expected points and return new instance."""
-        predicted, expected = points
-        if len(predicted) != len(expected):
-            raise ValueError("Points must have same dimensions")
+        """Add predicted and expected points and return new instance.
 
+        points can also be another accumulator of the same type, whose
+        points are merged in.
+        """
         new_obj = self.__class__()
-        new_obj._data = self._data.copy()
-        new_obj._data.append((predicted, expected))
+        new_obj._count = self._count
+        new_obj._squared_sum = self._squared_sum
+        new_obj += points
         return new_obj
 
     def __iadd__(self, points):
-        """Add predicted and expected points in place."""
+        """Add predicted and expected points in place.
+
+        points can also be another accumulator of the same type, whose
+        points are merged in.
+        """
+        if isinstance(points, RMSE):
+            return self.merge(points)
         predicted, expected = points
         if len(predicted) != len(expected):
             raise ValueError("Points must have same dimensions")
 
-        self._data.append((predicted, expected))
+        dist = self.distance(predicted, expected)
+        self._squared_sum += dist * dist
+        self._count += 1
+        return self
+
+    def add_batch(self, predicted, expected):
+        """Add many predicted and expected points in one pass.
+
+        A 1-D array is taken as a single point, and an empty batch adds
+        nothing.
+
+        :param predicted: 2-D array with one predicted point per row.
+        :param expected: 2-D array with one expected point per row.
+        :return: This instance, so calls can be chained.
+        """
+        predicted = np.asarray(predicted, dtype=float)
+        expected = np.asarray(expected, dtype=float)
+        if predicted.shape != expected.shape:
+            raise ValueError("Points must have same dimensions")
+        if not predicted.size:
+            return self
+        if predicted.ndim < 2:
+            predicted = predicted.reshape(1, -1)
+            expected = expected.reshape(1, -1)
+
+        distances = np.asarray(self.array_distance(predicted, expected),
+                               dtype=float)
+        self._squared_sum += float(distances @ distances)
+        self._count += len(distances)
+        return self
+
+    def merge(self, other):
+        """Merge in the points of another accumulator of the same type.
+
+        :param RMSE other: An accumulator using the same distance.
+        :return: This instance, so calls can be chained.
+        """
+        if type(other) is not type(self):
+            raise TypeError(f"Cannot merge {type(other).__name__} into "
+                            f"{type(self).__name__}.")
+        self._count += other._count
+        self._squared_sum += other._squared_sum
         return self
 
+    def save_state(self):
+        """Return the running totals, to send to another process.
+
+        :return: A dict that load_state() accepts.
+        """
+        return {"count": self._count, "squared_sum": self._squared_sum}
+
+    def load_state(self, state):
+        """Replace the running totals with ones from save_state().
+
+        :param state: A dict returned by save_state().
+        """
+        self._count = state["count"]
+        self._squared_sum = state["squared_sum"]
+
     def reset(self):
-        """Start over with empty data."""
-        self._data = []
+        """Start over with no points counted."""
+        self._count = 0
+        self._squared_sum = 0.0
+
+    @property
+    def count(self):
+        """Get the number of points added so far."""
+        return self._count
 
     @property
     def error(self):
@@ -46,15 +126,10 @@ class RMSE(ABC):
 
         Returns 0 if empty.
         """
-        if not self._data:
+        if not self._count:
             return 0
 
-        squared_error_sum = 0
-        for predicted, expected in self._data:
-            dist = self.distance(predicted, expected)
-            squared_error_sum += dist * dist
-
-        mean_squared_error = squared_error_sum / len(self._data)
+        mean_squared_error = self._squared_sum / self._count
         return sqrt(mean_squared_error)
 
     @staticmethod
@@ -63,20 +138,45 @@ class RMSE(ABC):
         """Find difference between predicted and expected point."""
         pass
 
+    @classmethod
+    def array_distance(cls, predicted, expected):
+        """Find the distance between each row of two 2-D arrays.
+
+        Subclasses should override this with a vectorized version; by
+        default distance() is called once per row.
+        """
+        return np.array([cls.distance(p, e)
+                         for p, e in zip(predicted, expected)])
+
 
 class Euclidean(RMSE):
     """Implements RMSE using Euclidean distance."""
 
+    __slots__ = ()
+
     @staticmethod
     def distance(predicted, expected):
         """Calculate Euclidean distance between two points."""
         return sqrt(sum((p - e) ** 2 for p, e in zip(predicted, expected)))
 
+    @staticmethod
+    def array_distance(predicted, expected):
+        """Calculate Euclidean distance between each pair of rows."""
+        difference = predicted - expected
+        return np.sqrt(np.einsum("ij,ij->i", difference, difference))
+
 
 class Taxicab(RMSE):
     """Uses Taxicab distance for the RMSE."""
 
+    __slots__ = ()
+
     @staticmethod
     def distance(predicted, expected):
         """Compute Taxicab distance of two points."""
         return sum(abs(p - e) for p, e in zip(predicted, expected))
+
+    @staticmethod
+    def array_distance(predicted, expected):
+        """Compute Taxicab distance of each pair of rows."""
+        return np.abs(predicted - expected).sum(axis=1)
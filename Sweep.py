@@ -0,0 +1,213 @@
+"""
+Parallel hyperparameter sweeps over FFBPNetwork configurations.
+
+A configuration is a dict with any of these keys:
+
+* "hidden_layers": sizes of the hidden layers, input side first
+* "hidden_activation": name of the hidden layers' activation
+* "learning_rate": learning rate for the neurodes
+* "epochs": number of epochs to train
+* "batch_size": batch size, or None to train one example at a time
+* "optimizer": name of the optimizer, or None for plain gradient descent
+
+Every configuration trains its own network on the same NNData in a
+pool of processes. run_folds() cross-validates one configuration the
+same way, training each fold in its own process. The features and
+labels are copied into shared memory once, or mapped from their files
+if the data set is file-backed, rather than pickled for each
+configuration. Networks use the data set's dtype, so a float32 data set
+sweeps float32 networks. Each run gets its own child of the data set's
+random stream, so a seeded data set gives the same results every time,
+however the runs are spread over the workers.
+"""
+
+from contextlib import redirect_stdout
+import io
+import itertools
+import multiprocessing
+import time
+
+import numpy as np
+
+import NNData
+from Activation import get_activation
+from FFBPNetwork import FFBPNetwork
+from Optimizer import get_optimizer
+from ParallelTrainer import attach_data, share_data
+from RMSE import Euclidean
+
+DEFAULTS = {
+    "hidden_layers": (),
+    "hidden_activation": "sigmoid",
+    "learning_rate": 0.05,
+    "epochs": 1000,
+    "batch_size": None,
+    "optimizer": None,
+}
+
+# the shared data set, set up in each worker by _attach()
+_worker = {}
+
+
+def _attach(data, data_state, error_model):
+    """Rebuild the shared data set in a worker without copying it."""
+    blocks, features, labels = attach_data(data)
+    data_set = NNData.NNData.from_arrays(features, labels)
+    data_set.load_state(data_state)
+    _worker["blocks"] = blocks
+    _worker["data_set"] = data_set
+    _worker["error_model"] = error_model
+
+
+def _run_config(task):
+    """Train one configuration and measure how it did."""
+    config, rng, data_state = task
+    settings = dict(DEFAULTS, **config)
+    data_set = _worker["data_set"]
+    if data_state is not None:
+        # a cross-validation fold: same arrays, its own split
+        data_set.load_state(data_state)
+    data_rng, network_rng = rng.spawn(2)
+    data_set.reseed(data_rng)
+    network = FFBPNetwork(data_set.features.shape[1],
+                          data_set.labels.shape[1], _worker["error_model"],
+                          dtype=data_set.dtype, seed=network_rng)
+    activation = get_activation(settings["hidden_activation"])
+    for position, size in enumerate(settings["hidden_layers"]):
+        network.add_hidden_layer(size, position, activation)
+    network.layers.input_nodes[0].learning_rate = settings["learning_rate"]
+    optimizer = None
+    if settings["optimizer"] is not None:
+        optimizer = get_optimizer(settings["optimizer"])
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        train_rmse = network.train(data_set, settings["epochs"], 0,
+                                   batch_size=settings["batch_size"],
+                                   optimizer=optimizer)
+    seconds = time.perf_counter() - start
+    test_rmse = None
+    test_indices = data_set.indices(NNData.Set.TEST)
+    if len(test_indices):
+        errors = _worker["error_model"]()
+        # score in batches so a large test set is never gathered whole
+        for start in range(0, len(test_indices), 4096):
+            batch = test_indices[start:start + 4096]
+            errors.add_batch(network.predict(data_set.features[batch]),
+                             data_set.labels[batch])
+        test_rmse = errors.error
+    return {"config": config, "train_rmse": train_rmse,
+            "test_rmse": test_rmse, "seconds": seconds}
+
+
+def _run_tasks(tasks, data_set, error_model, workers):
+    """Run _run_config() on every task in a pool sharing the data."""
+    blocks = []
+    try:
+        blocks, data = share_data(data_set)
+        with multiprocessing.Pool(
+                workers, _attach,
+                (data, data_set.save_state(), error_model)) as pool:
+            return pool.map(_run_config, tasks)
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def grid(space):
+    """List every combination of the values in a search space.
+
+    :param dict space: Lists of values to try, keyed by setting name.
+    :return: A list of configuration dicts.
+    """
+    names = list(space)
+    return [dict(zip(names, values))
+            for values in itertools.product(*(space[n] for n in names))]
+
+
+def random_search(space, count, seed=None):
+    """Draw random configurations from a search space.
+
+    :param dict space: Values to draw from, keyed by setting name. A
+        list is sampled from; a (low, high) tuple is drawn uniformly,
+        as an integer if both ends are integers.
+    :param int count: Number of configurations to draw.
+    :param seed: Seed or np.random.Generator to draw with (default is
+        None, a fresh generator).
+    :return: A list of configuration dicts.
+    """
+    rng = np.random.default_rng(seed)
+
+    def draw(values):
+        if isinstance(values, tuple):
+            low, high = values
+            if isinstance(low, int) and isinstance(high, int):
+                return int(rng.integers(low, high, endpoint=True))
+            return float(rng.uniform(low, high))
+        return values[rng.integers(len(values))]
+
+    return [{name: draw(values) for name, values in space.items()}
+            for _ in range(count)]
+
+
+def run_sweep(configs, data_set, error_model=Euclidean, workers=None):
+    """Train every configuration in a pool of processes.
+
+    :param list configs: Configuration dicts, such as from grid().
+    :param NNData data_set: An NNData object with a dataset loaded.
+    :param error_model: RMSE subclass to score with (default is
+        Euclidean).
+    :param int workers: Number of worker processes (default is None,
+        one per CPU).
+    :return: One row per configuration, best first. Rows are ranked by
+        test RMSE when the data set has a test split, otherwise by the
+        RMSE of the final training epoch.
+    """
+    if data_set.number_of_samples(NNData.Set.TRAIN) == 0:
+        raise FFBPNetwork.EmptySetException
+    tasks = [(config, rng, None)
+             for config, rng in zip(configs, data_set.rng.spawn(len(configs)))]
+    rows = _run_tasks(tasks, data_set, error_model, workers)
+    key = "train_rmse" if rows and rows[0]["test_rmse"] is None \
+        else "test_rmse"
+    return sorted(rows, key=lambda row: row[key])
+
+
+def run_folds(config, data_set, k, stratify=None, error_model=Euclidean,
+              workers=None):
+    """Cross-validate one configuration, training the folds in parallel.
+
+    The folds are views from NNData.folds(), so only their index lists
+    are sent to the workers; the features and labels are shared once.
+
+    :param dict config: A configuration dict.
+    :param NNData data_set: An NNData object with a dataset loaded.
+    :param int k: Number of folds.
+    :param bool stratify: Whether to spread each class of label evenly
+        across the folds (default is None, as the data set was split).
+    :param error_model: RMSE subclass to score with (default is
+        Euclidean).
+    :param int workers: Number of worker processes (default is None,
+        one per CPU).
+    :return: One row per fold, in fold order, each with a "fold" key
+        and the test RMSE on that fold.
+    """
+    tasks = [(config, fold.rng, fold.save_state())
+             for fold in data_set.folds(k, stratify)]
+    rows = _run_tasks(tasks, data_set, error_model, workers)
+    for fold, row in enumerate(rows):
+        row["fold"] = fold
+    return rows
+
+
+def format_table(rows):
+    """Lay out the rows from run_sweep() as a text table."""
+    lines = [f"{'rank':>4}  {'train RMSE':>10}  {'test RMSE':>10}  "
+             f"{'seconds':>8}  config"]
+    for rank, row in enumerate(rows, 1):
+        test_rmse = ("" if row["test_rmse"] is None
+                     else f"{row['test_rmse']:.6f}")
+        lines.append(f"{rank:>4}  {row['train_rmse']:>10.6f}  "
+                     f"{test_rmse:>10}  {row['seconds']:>8.3f}  "
+                     f"{row['config']}")
+    return "\n".join(lines)
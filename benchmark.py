@@ -0,0 +1,101 @@
+"""
+Micro-benchmarks for the neurode network.
+
+Run this module directly to print every report.
+"""
+
+import tracemalloc
+from timeit import timeit
+
+import numpy as np
+
+from DenseEngine import DenseEngine
+from FFBPNeurode import FFBPNeurode
+from LayerList import LayerList
+from Neurode import Neurode
+
+
+def bench_check_in(widths=(10, 100, 1000, 4000), rounds=20):
+    """Time how long one _check_in takes as a layer gets wider.
+
+    Each round has every upstream neighbor of one neurode report in,
+    which is what one sample costs that neurode in the feed forward.
+
+    :param widths: Numbers of upstream neighbors to try.
+    :param int rounds: Full rounds of check ins to time per width.
+    :return: A dict of nanoseconds per check in, keyed by width.
+    """
+    results = {}
+    side = Neurode.Side.UPSTREAM
+    for width in widths:
+        node = Neurode()
+        neighbors = [Neurode() for _ in range(width)]
+        node.reset_neighbors(neighbors, side)
+
+        def one_round():
+            for neighbor in neighbors:
+                node._check_in(neighbor, side)
+
+        seconds = timeit(one_round, number=rounds)
+        results[width] = seconds * 1e9 / (rounds * width)
+    return results
+
+
+def bench_memory(widths=(64, 256, 512)):
+    """Measure the memory a fully connected pair of layers takes.
+
+    :param widths: Numbers of neurodes to try in each layer.
+    :return: A dict of bytes per connection, keyed by width.
+    """
+    results = {}
+    for width in widths:
+        tracemalloc.start()
+        layers = LayerList(width, width, FFBPNeurode)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del layers
+        results[width] = size / (width * width)
+    return results
+
+
+def bench_dtype(width=256, batch_size=64, rounds=20,
+                dtypes=(np.float64, np.float32), seed=0):
+    """Time compiled batch training of a wide network in each dtype.
+
+    :param int width: Neurodes in every layer of the three layer network.
+    :param int batch_size: Samples per batch.
+    :param int rounds: Batches to time per dtype.
+    :param dtypes: Float types to try.
+    :param seed: Seed for the weights and the batch, the same for every
+        dtype so each one does the same work.
+    :return: A dict of milliseconds per batch, keyed by dtype name.
+    """
+    results = {}
+    for dtype in dtypes:
+        rng = np.random.default_rng(seed)
+        layers = LayerList(width, width, FFBPNeurode, dtype=dtype, rng=rng)
+        layers.add_layer(width)
+        engine = DenseEngine(layers)
+        inputs = rng.random((batch_size, width)).astype(dtype)
+        labels = rng.random((batch_size, width)).astype(dtype)
+        seconds = timeit(lambda: engine.train_batch(inputs, labels),
+                         number=rounds)
+        results[np.dtype(dtype).name] = seconds * 1e3 / rounds
+    return results
+
+
+def main():
+    """Print every benchmark report."""
+    print("check in cost by layer width")
+    for width, nanos in bench_check_in().items():
+        print(f"  {width:>6} neighbors: {nanos:8.1f} ns per check in")
+    print("memory by layer width")
+    for width, size in bench_memory().items():
+        print(f"  {width:>6} neurodes: {size:8.1f} bytes per connection")
+    print("compiled batch training by dtype")
+    for name, millis in bench_dtype().items():
+        print(f"  {name:>8}: {millis:8.3f} ms per batch")
+
+
+if __name__ == "__main__":
+    main()
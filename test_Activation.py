@@ -0,0 +1,92 @@
+import copy
+import pickle
+import pytest
+import numpy
+
+import RMSE
+from DenseEngine import DenseEngine
+from FFBPNetwork import FFBPNetwork
+from FrozenModel import FrozenModel
+
+try:
+    import Activation
+except ImportError:
+    pytest.fail("Cannot import Activation. Is Activation.py present?")
+
+ALL = [Activation.Sigmoid(), Activation.Tanh(), Activation.ReLU(),
+       Activation.LeakyReLU(.1)]
+
+
+@pytest.mark.parametrize("activation", ALL, ids=repr)
+def test_array_matches_scalar(activation):
+    totals = numpy.linspace(-3, 3, 13)
+    outputs = activation.array(totals)
+    assert numpy.allclose(outputs, [activation.value(t) for t in totals]), \
+        "array() should match value() element by element."
+    assert numpy.allclose(activation.array_derivative(outputs),
+                          [activation.derivative(o) for o in outputs]), \
+        "array_derivative() should match derivative() element by element."
+
+
+@pytest.mark.parametrize("activation", ALL, ids=repr)
+def test_derivative_of_output(activation):
+    totals = numpy.array([-2.1, -.7, .4, 1.9])
+    step = 1e-6
+    slopes = (activation.array(totals + step)
+              - activation.array(totals - step)) / (2 * step)
+    assert numpy.allclose(activation.array_derivative(
+        activation.array(totals)), slopes, atol=1e-5), \
+        "Derivatives should be the slope at the point giving each output."
+
+
+def test_get_activation():
+    assert Activation.get_activation("relu") == Activation.ReLU()
+    assert Activation.get_activation("leaky_relu", .2).param == .2
+    assert Activation.get_activation("leaky_relu") != \
+        Activation.LeakyReLU(.2)
+    with pytest.raises(ValueError):
+        Activation.get_activation("softmax")
+    with pytest.raises(ValueError):
+        Activation.LeakyReLU(0)
+
+
+@pytest.fixture()
+def network():
+    my_network = FFBPNetwork(2, 2, RMSE.Euclidean, Activation.Tanh())
+    my_network.add_hidden_layer(3, activation=Activation.ReLU())
+    my_network.add_hidden_layer(4, 1, Activation.LeakyReLU(.05))
+    return my_network
+
+
+def test_layer_activations(network):
+    assert network.layers.activations == [
+        Activation.ReLU(), Activation.LeakyReLU(.05), Activation.Tanh()], \
+        "Each layer should keep the activation it was added with."
+    copied = pickle.loads(pickle.dumps(network.layers))
+    assert copied.activations == network.layers.activations, \
+        "Activations should survive pickling."
+
+
+def test_engine_matches_neurodes(network):
+    twin = copy.deepcopy(network)
+    engine = DenseEngine(twin.layers)
+    samples = [([.3, -.8], [.5, -.2]), ([-.6, .9], [-.1, .7])]
+    for x, y in samples:
+        expected = network._train_sample(x, y)
+        predicted = engine.train_sample(x, y)
+        assert numpy.allclose(predicted, expected), \
+            "The engine should predict the same as the neurodes."
+    for mine, theirs in zip(network.layers.weight_matrices,
+                            twin.layers.weight_matrices):
+        assert numpy.allclose(mine, theirs), \
+            "The engine should train the same as the neurodes."
+
+
+def test_export_keeps_activations(network, tmp_path):
+    path = tmp_path / "model.bin"
+    network.export(path)
+    model = FrozenModel.load(path)
+    features = numpy.random.random((5, 2)) * 2 - 1
+    assert numpy.allclose(model.predict(features),
+                          network.predict(features)), \
+        "A loaded model should use the network's activations."
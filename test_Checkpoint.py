@@ -0,0 +1,113 @@
+import copy
+import pytest
+import numpy
+
+import NNData
+import RMSE
+from FFBPNetwork import FFBPNetwork
+from Optimizer import Adam
+
+try:
+    import Checkpoint
+except ImportError:
+    pytest.fail("Cannot import Checkpoint. Is Checkpoint.py present?")
+
+
+class Preempted(Exception):
+    pass
+
+
+class PreemptedData(NNData.NNData):
+    """Data set that stops the run when an epoch starts too late."""
+
+    stop_at = None
+
+    def prime_data(self, target_set=None, order=None):
+        if self.stop_at is not None:
+            if self.stop_at == 0:
+                raise Preempted
+            self.stop_at -= 1
+        super().prime_data(target_set, order)
+
+
+@pytest.fixture()
+def data():
+    features = [[i / 10, (i % 3) / 3] for i in range(10)]
+    labels = [[i % 2] for i in range(10)]
+    return PreemptedData(features, labels, .8)
+
+
+def make_network():
+    network = FFBPNetwork(2, 1, RMSE.Euclidean)
+    network.add_hidden_layer(3)
+    return network
+
+
+def test_save_and_load_checkpoint(tmp_path):
+    path = tmp_path / "run.ckpt"
+    Checkpoint.save_checkpoint(path, {"epoch": 1})
+    Checkpoint.save_checkpoint(path, {"epoch": 2})
+    assert Checkpoint.load_checkpoint(path) == {"epoch": 2}, \
+        "The newest checkpoint should replace the old one."
+    assert [p.name for p in tmp_path.iterdir()] == ["run.ckpt"], \
+        "No temporary files should be left behind."
+
+
+@pytest.mark.parametrize("batch_size", [None, 3])
+def test_resume_is_bit_for_bit(data, tmp_path, batch_size):
+    path = tmp_path / "run.ckpt"
+    network = make_network()
+    preempted = copy.deepcopy(network)
+    preempted_data = copy.deepcopy(data)
+    network.train(data, 7, 0, batch_size=batch_size)
+
+    preempted_data.stop_at = 5
+    with pytest.raises(Preempted):
+        preempted.train(preempted_data, 7, 0, batch_size=batch_size,
+                        checkpoint=path, checkpoint_every=2)
+    preempted_data.stop_at = None
+    preempted_data.reseed()
+    resumed = make_network()
+    resumed.resume(path, preempted_data, 0)
+    for ours, theirs in zip(resumed.layers.weight_matrices,
+                            network.layers.weight_matrices):
+        assert numpy.array_equal(ours, theirs), \
+            "A resumed run should end with exactly the same weights."
+
+
+def test_resume_warns_on_legacy_random_state(data, tmp_path):
+    path = tmp_path / "run.ckpt"
+    make_network().train(data, 2, 0, checkpoint=path, checkpoint_every=1)
+    state = Checkpoint.load_checkpoint(path)
+    state["random_state"] = (3, (0,) * 625, None)
+    Checkpoint.save_checkpoint(path, state)
+    with pytest.warns(UserWarning, match="random state"):
+        make_network().resume(path, data, 0)
+
+
+def test_resume_rejects_other_shapes(data, tmp_path):
+    path = tmp_path / "run.ckpt"
+    make_network().train(data, 2, 0, checkpoint=path, checkpoint_every=1)
+    with pytest.raises(ValueError):
+        FFBPNetwork(2, 1, RMSE.Euclidean).resume(path, data, 0)
+
+
+def test_resume_keeps_optimizer_state(data, tmp_path):
+    path = tmp_path / "run.ckpt"
+    network = make_network()
+    preempted = copy.deepcopy(network)
+    preempted_data = copy.deepcopy(data)
+    network.train(data, 7, 0, batch_size=3, optimizer=Adam(.01))
+
+    preempted_data.stop_at = 5
+    with pytest.raises(Preempted):
+        preempted.train(preempted_data, 7, 0, batch_size=3,
+                        checkpoint=path, checkpoint_every=2,
+                        optimizer=Adam(.01))
+    preempted_data.stop_at = None
+    resumed = make_network()
+    resumed.resume(path, preempted_data, 0)
+    for ours, theirs in zip(resumed.layers.weight_matrices,
+                            network.layers.weight_matrices):
+        assert numpy.array_equal(ours, theirs), \
+            "A resumed run should pick up the optimizer's state."
@@ -0,0 +1,157 @@
+import copy
+import pytest
+import numpy
+
+import NNData
+import RMSE
+from FFBPNetwork import FFBPNetwork
+
+try:
+    import DenseEngine
+except ImportError:
+    pytest.fail("Cannot import DenseEngine. Is DenseEngine.py present?")
+
+
+@pytest.fixture()
+def xor_data():
+    features = [[0, 0], [1, 0], [0, 1], [1, 1]]
+    labels = [[0], [1], [1], [0]]
+    return NNData.NNData(features, labels, 1)
+
+
+@pytest.fixture()
+def network():
+    my_network = FFBPNetwork(2, 1, RMSE.Euclidean)
+    my_network.add_hidden_layer(3)
+    my_network.add_hidden_layer(2, 1)
+    return my_network
+
+
+def all_weights(network):
+    layers = list(network.layers)
+    return [[[node.get_weight(up) for up in upstream] for node in downstream]
+            for upstream, downstream in zip(layers, layers[1:])]
+
+
+def test_weights_match_neurodes(network):
+    engine = DenseEngine.DenseEngine(network.layers)
+    assert len(engine.weights) == 3, \
+        "There should be one weight matrix per pair of layers."
+    assert [m.shape for m in engine.weights] == [(3, 2), (2, 3), (1, 2)], \
+        "Weight matrices should be shaped (downstream, upstream)."
+    for matrix, expected in zip(engine.weights, all_weights(network)):
+        assert numpy.array_equal(matrix, expected), \
+            "Engine weights do not match the neurode weights."
+
+
+def test_weights_are_shared_with_neurodes(network):
+    engine = DenseEngine.DenseEngine(network.layers)
+    inputs = network.layers.input_nodes
+    node = list(network.layers)[1][2]
+    node.adjust_weights(inputs[1], .5)
+    assert engine.weights[0][2, 1] == node.get_weight(inputs[1]), \
+        "Neurode weight changes should be seen by the engine."
+    engine.weights[0][2, 0] = .125
+    assert node.get_weight(inputs[0]) == .125, \
+        "Engine weight changes should be seen by the neurodes."
+    assert numpy.shares_memory(node._weights.array, engine.weights[0]), \
+        "Neurode weights should be a view into the layer matrix."
+
+
+def test_copies_share_weights(network):
+    twin = copy.deepcopy(network)
+    node = list(twin.layers)[1][0]
+    matrix = twin.layers.weight_matrices[0]
+    assert numpy.shares_memory(node._weights.array, matrix), \
+        "A copied network should share weights with its own matrices."
+    assert not numpy.shares_memory(matrix,
+                                   network.layers.weight_matrices[0]), \
+        "A copied network should not share weights with the original."
+
+
+def test_forward_matches_neurodes(network):
+    engine = DenseEngine.DenseEngine(network.layers)
+    for sample in ([0, 0], [1, 0], [.3, .7]):
+        for val, node in zip(sample, network.layers.input_nodes):
+            node.set_input(val)
+        expected = [node.value for node in network.layers.output_nodes]
+        assert numpy.allclose(engine.forward(sample)[-1], expected), \
+            "forward() does not match the neurode feed forward."
+
+
+def test_train_matches_neurodes(network, xor_data):
+    twin = copy.deepcopy(network)
+    network.train(xor_data, 20, 0, NNData.Order.STATIC)
+    twin.train(xor_data, 20, 0, NNData.Order.STATIC, compiled=True)
+    for ours, theirs in zip(all_weights(twin), all_weights(network)):
+        assert numpy.allclose(ours, theirs), \
+            "Compiled training should give the same weights as neurodes."
+
+
+def test_compiled_test_method(network, xor_data):
+    xor_data.split_set(.5)
+    network.test(xor_data, compiled=True)
+
+
+def test_train_batch_of_one_matches_train_sample(network):
+    engine = DenseEngine.DenseEngine(network.layers)
+    twin = copy.deepcopy(engine)
+    engine.train_sample([1, 0], [1])
+    twin.train_batch([[1, 0]], [[1]])
+    for ours, theirs in zip(twin.weights, engine.weights):
+        assert numpy.allclose(ours, theirs), \
+            "A batch of one should train like a single sample."
+
+
+def test_train_batch_averages_updates(network):
+    features = numpy.array([[0, 0], [1, 0], [0, 1], [1, 1]], dtype=float)
+    labels = numpy.array([[0], [1], [1], [0]], dtype=float)
+    engine = DenseEngine.DenseEngine(network.layers)
+    start = [matrix.copy() for matrix in engine.weights]
+    changes = [numpy.zeros_like(matrix) for matrix in start]
+    for x, y in zip(features, labels):
+        single = copy.deepcopy(engine)
+        single.train_sample(x, y)
+        for change, matrix, before in zip(changes, single.weights, start):
+            change += (matrix - before) / len(features)
+    predicted = engine.train_batch(features, labels)
+    assert predicted.shape == (4, 1), \
+        "train_batch should return one row of outputs per sample."
+    for matrix, before, change in zip(engine.weights, start, changes):
+        assert numpy.allclose(matrix, before + change), \
+            "train_batch should apply the average of the sample updates."
+
+
+def test_batch_training(network, xor_data):
+    network.train(xor_data, 5, 0, batch_size=3)
+    network.train(xor_data, 5, 0, batch_size=10)
+
+
+def test_float32(network):
+    single = FFBPNetwork(2, 1, RMSE.Euclidean, dtype=numpy.float32)
+    single.add_hidden_layer(3)
+    single.add_hidden_layer(2, 1)
+    for matrix, weights in zip(single.layers.weight_matrices,
+                               network.layers.weight_matrices):
+        assert matrix.dtype == numpy.float32, \
+            "Weight matrices should be stored in the network's dtype."
+        matrix[...] = weights
+    engine = DenseEngine.DenseEngine(single.layers)
+    expected = DenseEngine.DenseEngine(network.layers)
+    inputs = [[.1, .9], [.7, .3]]
+    labels = [[1], [0]]
+    predicted = engine.train_batch(inputs, labels)
+    assert predicted.dtype == numpy.float32, \
+        "A float32 network should compute in float32."
+    assert numpy.allclose(predicted, expected.train_batch(inputs, labels),
+                          atol=1e-6), \
+        "A float32 network should predict like a float64 one."
+    for ours, theirs in zip(single.layers.weight_matrices,
+                            network.layers.weight_matrices):
+        assert ours.dtype == numpy.float32, \
+            "Training should keep the weights in float32."
+        assert numpy.allclose(ours, theirs, atol=1e-6), \
+            "A float32 network should train like a float64 one."
+    assert single.predict(inputs).dtype == numpy.float32
+    with pytest.raises(ValueError):
+        FFBPNetwork(2, 1, RMSE.Euclidean, dtype=int)
@@ -1,4 +1,6 @@
+import copy
 import pytest
+import numpy
 import NNData
 import RMSE
 
@@ -124,3 +126,73 @@ def test_add_hidden_layer():
     except:
         pytest.fail("Could not add third hidden layer after first two.")
 
+
+def test_predict():
+    network = FFBPNetwork.FFBPNetwork(2, 3, RMSE.Euclidean)
+    network.add_hidden_layer(4)
+    features = numpy.array([[0, 0], [1, 0], [0, 1], [.5, .5]])
+    values = [node.value for node in network.layers.output_nodes]
+    predicted = network.predict(features)
+    assert predicted.shape == (4, 3), \
+        "predict() should return one row of outputs per sample."
+    assert [node.value for node in network.layers.output_nodes] == values, \
+        "predict() should not change any neurode values."
+    for row, sample in zip(predicted, features):
+        for val, node in zip(sample, network.layers.input_nodes):
+            node.set_input(val)
+        expected = [node.value for node in network.layers.output_nodes]
+        assert numpy.allclose(row, expected), \
+            "predict() should match feeding each sample forward."
+    with pytest.raises(ValueError):
+        network.predict([[1, 2, 3]])
+
+
+def test_early_stopping(capsys):
+    features = [[i / 20, (i % 5) / 5] for i in range(20)]
+    labels = [[i % 2] for i in range(20)]
+    data = NNData.NNData(features, labels, 1, validation_factor=.25)
+    network = FFBPNetwork.FFBPNetwork(2, 1, RMSE.Euclidean)
+    network.add_hidden_layer(3)
+    twin = copy.deepcopy(network)
+    twin_data = copy.deepcopy(data)
+    error = network.train(data, 50, 1, patience=1, min_delta=10)
+    assert "Stopping early after epoch 1" in capsys.readouterr().out, \
+        "Training should stop once patience runs out."
+    train = data.indices(NNData.Set.TRAIN)
+    expected = RMSE.Euclidean().add_batch(
+        network.predict(data.features[train]), data.labels[train])
+    assert error == pytest.approx(expected.error), \
+        "The returned RMSE should be for the restored weights."
+    chunked = network._score(data, NNData.Set.TRAIN, batch_size=4)
+    assert chunked.count == len(train) \
+        and chunked.error == pytest.approx(expected.error), \
+        "Scoring in batches should match scoring the set at once."
+    twin.train(twin_data, 1, 0)
+    for ours, theirs in zip(network.layers.weight_matrices,
+                            twin.layers.weight_matrices):
+        assert numpy.array_equal(ours, theirs), \
+            "Early stopping should restore the best epoch's weights."
+    with pytest.raises(FFBPNetwork.FFBPNetwork.EmptySetException):
+        network.train(NNData.NNData(features, labels, 1), 5, 0, patience=2)
+
+
+def test_seeded_networks():
+    features = [[i / 20, (i % 5) / 5] for i in range(20)]
+    labels = [[i % 2] for i in range(20)]
+    weights = []
+    for _ in range(2):
+        network = FFBPNetwork.FFBPNetwork(2, 1, RMSE.Euclidean, seed=3)
+        network.add_hidden_layer(4)
+        network.train(NNData.NNData(features, labels, .8, seed=5), 5, 0,
+                      batch_size=4)
+        weights.append(network.layers.weight_matrices)
+    for ours, theirs in zip(*weights):
+        assert numpy.array_equal(ours, theirs), \
+            "Seeded networks and data should train bit for bit alike."
+    other = FFBPNetwork.FFBPNetwork(2, 1, RMSE.Euclidean, seed=4)
+    other.add_hidden_layer(4)
+    assert not numpy.array_equal(other.layers.weight_matrices[0],
+                                 FFBPNetwork.FFBPNetwork(
+                                     2, 1, RMSE.Euclidean, seed=3)
+                                 .layers.weight_matrices[0]), \
+        "Different seeds should draw different weights."
@@ -0,0 +1,60 @@
+import io
+import pytest
+import numpy
+
+import RMSE
+from FFBPNetwork import FFBPNetwork
+
+try:
+    import FrozenModel
+except ImportError:
+    pytest.fail("Cannot import FrozenModel. Is FrozenModel.py present?")
+
+
+@pytest.fixture()
+def network():
+    my_network = FFBPNetwork(3, 2, RMSE.Euclidean)
+    my_network.add_hidden_layer(5)
+    my_network.add_hidden_layer(4, 1)
+    return my_network
+
+
+def test_export_and_load(network, tmp_path):
+    path = tmp_path / "model.bin"
+    network.export(path)
+    assert path.exists(), "export() should write to the exact path given."
+    model = FrozenModel.FrozenModel.load(path)
+    assert model.layer_sizes == [3, 5, 4, 2], \
+        "A loaded model should have the same layer sizes."
+    features = numpy.random.random((6, 3))
+    assert numpy.allclose(model.predict(features),
+                          network.predict(features)), \
+        "A loaded model should predict the same as the network."
+
+
+def test_export_to_file_object(network):
+    buffer = io.BytesIO()
+    network.export(buffer)
+    buffer.seek(0)
+    model = FrozenModel.FrozenModel.load(buffer)
+    assert numpy.allclose(model.predict([[1, 0, 1]]),
+                          network.predict([[1, 0, 1]])), \
+        "export() should also write to open binary files."
+    with pytest.raises(ValueError):
+        model.predict([[1, 0]])
+
+
+def test_export_float32(tmp_path):
+    network = FFBPNetwork(3, 2, RMSE.Euclidean, dtype=numpy.float32)
+    network.add_hidden_layer(4)
+    path = tmp_path / "model.bin"
+    network.export(path)
+    model = FrozenModel.FrozenModel.load(path)
+    assert model.dtype == numpy.float32, \
+        "A float32 network should export float32 weights."
+    features = numpy.random.random((6, 3))
+    predicted = model.predict(features)
+    assert predicted.dtype == numpy.float32, \
+        "A float32 model should predict in float32."
+    assert numpy.allclose(predicted, network.predict(features)), \
+        "A loaded float32 model should predict the same as the network."
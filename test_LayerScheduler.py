@@ -0,0 +1,57 @@
+import copy
+import pytest
+import numpy
+
+import RMSE
+from FFBPNetwork import FFBPNetwork
+
+try:
+    import LayerScheduler
+except ImportError:
+    pytest.fail("Cannot import LayerScheduler. Is LayerScheduler.py present?")
+
+
+@pytest.fixture()
+def network():
+    my_network = FFBPNetwork(2, 2, RMSE.Euclidean)
+    my_network.add_hidden_layer(3)
+    my_network.add_hidden_layer(4, 1)
+    return my_network
+
+
+def recursive_train_sample(network, x, y):
+    for val, node in zip(x, network.layers.input_nodes):
+        node.set_input(val)
+    for val, node in zip(y, network.layers.output_nodes):
+        node.set_expected(val)
+    return [node.value for node in network.layers.output_nodes]
+
+
+def test_forward_matches_recursion(network):
+    scheduler = LayerScheduler.LayerScheduler(network.layers)
+    predicted = scheduler.forward([.2, .9])
+    for val, node in zip([.2, .9], network.layers.input_nodes):
+        node.set_input(val)
+    assert predicted == [node.value for node in network.layers.output_nodes], \
+        "forward() should give the same values as set_input()."
+
+
+def test_train_matches_recursion(network):
+    twin = copy.deepcopy(network)
+    scheduler = LayerScheduler.LayerScheduler(twin.layers)
+    for x, y in (([0, 1], [1, 0]), ([1, 1], [0, 1]), ([.5, 0], [1, 1])):
+        expected = recursive_train_sample(network, x, y)
+        assert scheduler.train_sample(x, y) == expected, \
+            "train_sample() should predict the same values as recursion."
+    for ours, theirs in zip(twin.layers.weight_matrices,
+                            network.layers.weight_matrices):
+        assert numpy.array_equal(ours, theirs), \
+            "train_sample() should update weights the same as recursion."
+
+
+def test_deep_network_does_not_recurse():
+    deep = FFBPNetwork(2, 1, RMSE.Euclidean)
+    for _ in range(400):
+        deep.add_hidden_layer(2)
+    scheduler = LayerScheduler.LayerScheduler(deep.layers)
+    scheduler.train_sample([1, 0], [1])
@@ -0,0 +1,96 @@
+import pickle
+import pytest
+import numpy
+
+import NNData
+import RMSE
+from FFBPNetwork import FFBPNetwork
+
+try:
+    import Metrics
+except ImportError:
+    pytest.fail("Cannot import Metrics. Is Metrics.py present?")
+
+
+@pytest.fixture()
+def samples():
+    rng = numpy.random.default_rng(7)
+    return rng.random((40, 3)), rng.random((40, 3))
+
+
+def test_per_output_metrics(samples):
+    predicted, expected = samples
+    metrics = Metrics.Metrics()
+    metrics.add_batch([], [])
+    assert metrics.count == 0, "An empty batch should add no samples."
+    metrics.add_batch(predicted[:25], expected[:25])
+    for point in zip(predicted[25:], expected[25:]):
+        metrics += point
+    errors = numpy.abs(predicted - expected)
+    assert metrics.count == 40
+    assert numpy.allclose(metrics.rmse,
+                          numpy.sqrt((errors ** 2).mean(axis=0))), \
+        "rmse should be the root mean squared error of each output."
+    assert numpy.allclose(metrics.mae, errors.mean(axis=0))
+    assert numpy.array_equal(metrics.max_error, errors.max(axis=0))
+    assert metrics.confusion_matrix is None and metrics.accuracy is None, \
+        "Classification metrics should only be kept when asked for."
+    with pytest.raises(ValueError):
+        metrics.add_batch(predicted[:, :2], expected[:, :2])
+
+
+def test_confusion_matrix():
+    expected = numpy.eye(3)[[0, 1, 2, 2]]
+    predicted = numpy.array([[.9, .1, 0], [.2, .1, .7], [0, .3, .6],
+                             [.1, .2, .3]])
+    metrics = Metrics.Metrics(classify=True).add_batch(predicted, expected)
+    assert metrics.confusion_matrix.tolist() == [[1, 0, 0], [0, 0, 1],
+                                                 [0, 0, 2]], \
+        "Rows should be expected classes and columns predicted classes."
+    assert metrics.accuracy == .75
+    binary = Metrics.Metrics(classify=True, threshold=.4)
+    binary.add_batch([[.5], [.3], [.1]], [[1], [1], [0]])
+    assert binary.confusion_matrix.tolist() == [[1, 0], [1, 1]], \
+        "A single output should be split into two classes at threshold."
+    assert "accuracy" in binary.report()
+
+
+def test_merge_and_state(samples):
+    predicted, expected = samples
+    whole = Metrics.Metrics(True).add_batch(predicted, expected)
+    parts = [Metrics.Metrics(True).add_batch(predicted[i:i + 10],
+                                             expected[i:i + 10])
+             for i in range(0, 40, 10)]
+    merged = Metrics.Metrics(True)
+    for part in reversed(parts):
+        merged += pickle.loads(pickle.dumps(part))
+    assert merged.count == 40
+    assert numpy.allclose(merged.rmse, whole.rmse)
+    assert numpy.array_equal(merged.max_error, whole.max_error)
+    assert numpy.array_equal(merged.confusion_matrix,
+                             whole.confusion_matrix), \
+        "Merged parts should give the same metrics as one pass."
+    copied = Metrics.Metrics()
+    copied.load_state(whole.save_state())
+    copied.add_batch(predicted, expected)
+    assert whole.count == 40, \
+        "Loading a saved state should not share totals with the original."
+    with pytest.raises(ValueError):
+        merged.merge(Metrics.Metrics())
+
+
+def test_network_evaluate():
+    features = [[i / 10, (i % 3) / 3] for i in range(10)]
+    labels = [[i % 2, 1 - i % 2] for i in range(10)]
+    data = NNData.NNData(features, labels, .5)
+    network = FFBPNetwork(2, 2, RMSE.Euclidean)
+    network.add_hidden_layer(3)
+    metrics = network.evaluate(data, classify=True, batch_size=2)
+    indices = data.indices(NNData.Set.TEST)
+    predicted = network.predict(data.features[indices])
+    assert metrics.count == 5
+    assert numpy.allclose(metrics.mae, numpy.abs(
+        predicted - data.labels[indices]).mean(axis=0))
+    assert metrics.confusion_matrix.sum() == 5
+    with pytest.raises(FFBPNetwork.EmptySetException):
+        network.evaluate(data, NNData.Set.VALIDATION)
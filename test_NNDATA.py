@@ -1,6 +1,5 @@
 import pytest
 import copy
-import collections
 import numpy
 
 #
@@ -98,18 +97,22 @@ def test_empty_constructor(bare_constructor: type(NNData.NNData)):
     assert my_data._labels is None, \
         ("self._features and self._labels should be set to None in "
          "the constructor to avoid warnings")
-    assert my_data._train_indices == [], \
+    assert len(my_data._train_indices) == 0, \
         ("self._train_indices and self._test_indices should be set "
-         "to empty lists in the constructor.")
-    assert my_data._test_indices == [], \
+         "to empty arrays in the constructor.")
+    assert len(my_data._test_indices) == 0, \
         ("self._train_indices and self._test_indices should be set "
-         "to empty lists in the constructor.")
-    assert isinstance(my_data._train_pool, collections.deque), \
+         "to empty arrays in the constructor.")
+    assert isinstance(my_data._train_pool, numpy.ndarray), \
         ("self._train_pool and self._test_pool should be "
-         "initialized as empty deques in the constructor.")
-    assert isinstance(my_data._test_pool, collections.deque), \
+         "initialized as empty index arrays in the constructor.")
+    assert isinstance(my_data._test_pool, numpy.ndarray), \
         ("self._train_pool and self._test_pool should be "
-         "initialized as empty deques in the constructor.")
+         "initialized as empty index arrays in the constructor.")
+    assert my_data.pool_is_empty(NNData.Set.TRAIN), \
+        "self._train_pool should start out empty."
+    assert my_data.pool_is_empty(NNData.Set.TEST), \
+        "self._test_pool should start out empty."
 
 
 def test_load_data_normal_operation(fake_constructor: type(NNData.NNData)):
@@ -246,11 +249,11 @@ def test_split_set(bare_constructor: type(NNData.NNData)):
     my_data._features = None
     my_data._labels = None
     my_data.split_set(.5)
-    assert my_data._train_indices == [], \
-        ("train_indices should be an empty list if no examples are "
+    assert len(my_data._train_indices) == 0, \
+        ("train_indices should be an empty array if no examples are "
          "loaded.")
-    assert my_data._test_indices == [], \
-        ("test_indices should be an empty list if no examples are "
+    assert len(my_data._test_indices) == 0, \
+        ("test_indices should be an empty array if no examples are "
          "loaded.")
     try:
         my_data.split_set()
@@ -267,10 +270,10 @@ def test_prime_data(bare_constructor: type(NNData.NNData)):
     my_data._train_indices = [3, 0, 5]
     my_data._test_indices = [4, 2, 1, 6, 7]
     my_data.prime_data()
-    assert isinstance(my_data._train_pool, collections.deque), \
-        "Is self._train_pool a deque?"
-    assert isinstance(my_data._test_pool, collections.deque), \
-        "Is self._test_pool a deque?"
+    assert isinstance(my_data._train_pool, numpy.ndarray), \
+        "Is self._train_pool an index array?"
+    assert isinstance(my_data._test_pool, numpy.ndarray), \
+        "Is self._test_pool an index array?"
     train_list = list(my_data._train_pool)
     assert set(train_list) == {3, 0, 5}, \
         ("self._train_pool does not contain the correct items when "
@@ -290,17 +293,15 @@ def test_prime_data(bare_constructor: type(NNData.NNData)):
         my_data.prime_data(target_set=NNData.Set.TRAIN)
     except TypeError:
         my_data.prime_data(my_set=NNData.Set.TRAIN)
-    while my_data._test_pool:
-        my_data._test_pool.popleft()
+    my_data._test_cursor = len(my_data._test_pool)
     train_list = list(my_data._train_pool)
     assert set(train_list) == {3, 0, 5}, \
         ("self._train_pool does not contain the correct items when "
          "prime_data is called with target_set=NNData.Set.TRAIN.")
-    assert len(my_data._test_pool) == 0, \
+    assert my_data.pool_is_empty(NNData.Set.TEST), \
         ("self._test_pool should not be reset when "
          "prime_data is called with target_set=NNData.Set.TRAIN.")
-    while my_data._train_pool:
-        my_data._train_pool.popleft()
+    my_data._train_cursor = len(my_data._train_pool)
     try:
         my_data.prime_data(target_set=NNData.Set.TEST)
     except TypeError:
@@ -309,7 +310,7 @@ def test_prime_data(bare_constructor: type(NNData.NNData)):
     assert set(test_list) == {4, 2, 1, 6, 7}, \
         ("self._test_pool does not contain the correct items when "
          "prime_data is called with target_set=NNData.Set.TEST.")
-    assert len(my_data._train_pool) == 0, \
+    assert my_data.pool_is_empty(NNData.Set.TRAIN), \
         ("self._train_pool should not be reset when "
          "prime_data is called with target_set=NNData.Set.TEST.")
     static_list = [i for i in range(100)]
@@ -330,8 +331,8 @@ def test_pool_is_empty(bare_constructor: type(NNData.NNData)):
     except:
         pytest.fail("Is prime_data() implemented?")
     my_data = bare_constructor()
-    my_data._test_pool = collections.deque([0, 1])
-    my_data._train_pool = collections.deque([0, 1])
+    my_data._test_pool = numpy.array([0, 1], dtype=numpy.intp)
+    my_data._train_pool = numpy.array([0, 1], dtype=numpy.intp)
     assert not my_data.pool_is_empty(), \
         ("pool_is_empty should return False when no argument is "
          "provided and self._train_pool is not empty")
@@ -341,7 +342,7 @@ def test_pool_is_empty(bare_constructor: type(NNData.NNData)):
     assert not my_data.pool_is_empty(NNData.Set.TEST), \
         ("pool_is_empty should return False when NNData.Set.TEST is passed "
          "as an argument and self._test_pool is not empty")
-    my_data._train_pool = collections.deque()
+    my_data._train_pool = numpy.array([], dtype=numpy.intp)
     assert my_data.pool_is_empty(), \
         ("pool_is_empty should return True when no argument is "
          "provided and self._train_pool is empty")
@@ -351,7 +352,7 @@ def test_pool_is_empty(bare_constructor: type(NNData.NNData)):
     assert not my_data.pool_is_empty(NNData.Set.TEST), \
         ("pool_is_empty should return False when NNData.Set.TEST is passed "
          "as an argument and self._test_pool is not empty")
-    my_data._test_pool = collections.deque()
+    my_data._test_pool = numpy.array([], dtype=numpy.intp)
     assert my_data.pool_is_empty(NNData.Set.TEST), \
         ("pool_is_empty should return True when NNData.Set.TEST is passed "
          "as an argument and self._test_pool is empty")
@@ -363,8 +364,8 @@ def test_get_one_item(bare_constructor: type(NNData.NNData)):
     except:
         pytest.fail("Is get_one_item() implemented?")
     my_data = bare_constructor()
-    my_data._test_pool = collections.deque([4, 0, 1])
-    my_data._train_pool = collections.deque([2, 5, 3])
+    my_data._test_pool = numpy.array([4, 0, 1], dtype=numpy.intp)
+    my_data._train_pool = numpy.array([2, 5, 3], dtype=numpy.intp)
     my_data._features = numpy.array([[.1], [.2], [.3], [.4], [.5], [.6]],
                                     dtype=float)
     my_data._labels = numpy.array([[1], [2], [3], [4], [5], [6]],
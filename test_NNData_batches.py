@@ -0,0 +1,152 @@
+import copy
+import pytest
+import numpy
+
+import NNData
+
+
+@pytest.fixture()
+def my_data():
+    features = [[.1], [.2], [.3], [.4], [.5], [.6], [.7], [.8]]
+    labels = [[1], [2], [3], [4], [5], [6], [7], [8]]
+    return NNData.NNData(features, labels, 1)
+
+
+def test_get_batch(my_data):
+    my_data.prime_data(order=NNData.Order.STATIC)
+    expected = list(my_data._train_indices)
+    features, labels = my_data.get_batch(NNData.Set.TRAIN, 3)
+    assert features.shape == (3, 1) and labels.shape == (3, 1), \
+        "get_batch should return 2-D arrays with one row per item."
+    assert numpy.array_equal(labels[:, 0], [i + 1 for i in expected[:3]]), \
+        "get_batch should take items in pool order."
+    assert numpy.array_equal(my_data.save_state()["train_pool"],
+                             expected[3:]), \
+        "save_state should keep only the indices not yet taken."
+    features, labels = my_data.get_batch(NNData.Set.TRAIN, 10)
+    assert len(features) == 5, \
+        "get_batch should return the rest of the pool when it runs short."
+    assert my_data.get_batch(NNData.Set.TRAIN, 3) is None, \
+        "get_batch should return None when the pool is empty."
+    with pytest.raises(ValueError):
+        my_data.get_batch(NNData.Set.TRAIN, 0)
+
+
+def test_dtype():
+    features = numpy.arange(8, dtype=numpy.float32).reshape(4, 2)
+    my_data = NNData.NNData(features, [[0], [1], [1], [0]], 1,
+                            dtype=numpy.float32)
+    assert my_data.dtype == numpy.float32
+    assert my_data.features is not features \
+        and numpy.array_equal(my_data.features, features), \
+        "The constructor should copy the caller's features."
+    features[0, 0] = 99
+    assert my_data.features[0, 0] == 0, \
+        "Changing the caller's array should not change the data set."
+    wrapped = NNData.NNData.from_arrays(features, [[0], [1], [1], [0]], 1)
+    assert wrapped.features is features and wrapped.dtype == numpy.float32, \
+        "from_arrays() should use the array as it is, in its own dtype."
+    assert wrapped.number_of_samples(NNData.Set.TRAIN) == 4
+    with pytest.raises(ValueError):
+        NNData.NNData.from_arrays(features, [[0]])
+    assert my_data.labels.dtype == numpy.float32, \
+        "Labels should be stored in the data set's dtype."
+    my_data.prime_data()
+    assert my_data.get_batch(batch_size=2)[0].dtype == numpy.float32, \
+        "Batches should keep the data set's dtype."
+    assert NNData.NNData([[1]], [[1]]).dtype == numpy.float64, \
+        "Data sets should default to float64."
+    with pytest.raises(ValueError):
+        NNData.NNData([[1]], [[1]], dtype=numpy.int32)
+
+
+def test_validation_split():
+    features = [[i] for i in range(20)]
+    labels = [[i] for i in range(20)]
+    my_data = NNData.NNData(features, labels, .5, validation_factor=.2)
+    assert my_data.number_of_samples(NNData.Set.TRAIN) == 8
+    assert my_data.number_of_samples(NNData.Set.VALIDATION) == 2
+    assert my_data.number_of_samples(NNData.Set.TEST) == 10
+    assert my_data.number_of_samples() == 20
+    train = set(my_data.indices(NNData.Set.TRAIN))
+    validation = set(my_data.indices(NNData.Set.VALIDATION))
+    assert not train & validation, \
+        "Validation samples should be held out of the training set."
+    assert not validation & set(my_data.indices(NNData.Set.TEST)), \
+        "Validation samples should come from the training share."
+    my_data.prime_data(order=NNData.Order.STATIC)
+    _, batch_labels = my_data.get_batch(NNData.Set.VALIDATION, 5)
+    assert set(batch_labels[:, 0]) == validation
+    assert my_data.pool_is_empty(NNData.Set.VALIDATION)
+    restored = NNData.NNData(features, labels, .5)
+    restored.load_state(my_data.save_state())
+    assert set(restored.indices(NNData.Set.VALIDATION)) == validation, \
+        "save_state() should keep the validation set."
+    my_data.split_set(new_validation_factor=0)
+    assert my_data.number_of_samples(NNData.Set.TRAIN) == 10
+    assert my_data.number_of_samples(NNData.Set.VALIDATION) == 0
+
+
+def test_iter_batches(my_data):
+    batches = list(my_data.iter_batches(NNData.Set.TRAIN, 3))
+    assert [len(features) for features, _ in batches] == [3, 3, 2], \
+        "iter_batches should yield full batches and then the remainder."
+    labels = numpy.concatenate([labels for _, labels in batches])
+    assert numpy.array_equal(labels[:, 0],
+                             [i + 1 for i in my_data.indices()]), \
+        "iter_batches should keep index order unless asked to shuffle."
+    assert my_data.pool_is_empty(NNData.Set.TRAIN), \
+        "iter_batches should empty the pool it primed."
+    for contiguous in (False, True):
+        batches = list(my_data.iter_batches(NNData.Set.TRAIN, 3,
+                                            NNData.Order.SHUFFLE, contiguous))
+        features = numpy.concatenate([features for features, _ in batches])
+        labels = numpy.concatenate([labels for _, labels in batches])
+        assert sorted(labels[:, 0]) == list(range(1, 9)), \
+            "A shuffled pass should still yield every item once."
+        assert numpy.allclose(features[:, 0] * 10, labels[:, 0]), \
+            "Features and labels should stay paired."
+    features, _ = next(my_data.iter_batches(NNData.Set.TRAIN, 3,
+                                            contiguous=True))
+    assert features.base is not None and features.flags.c_contiguous, \
+        "Contiguous batches should be slices of one reordered copy."
+    assert list(my_data.iter_batches(NNData.Set.TEST, 3)) == [], \
+        "An empty set should yield no batches."
+    with pytest.raises(ValueError):
+        next(my_data.iter_batches(NNData.Set.TRAIN, 0))
+
+
+def test_vectorized_shuffle(my_data):
+    my_data.reseed(4)
+    shuffled = my_data.indices(NNData.Set.TRAIN, NNData.Order.SHUFFLE)
+    assert sorted(shuffled) == list(range(8)), \
+        "Shuffled indices should hold every sample once."
+    my_data.reseed(4)
+    my_data.prime_data(NNData.Set.TRAIN, NNData.Order.SHUFFLE)
+    assert numpy.array_equal(my_data._train_pool, shuffled), \
+        "Reseeding should repeat the same pool order."
+    assert my_data._train_pool.dtype == numpy.intp, \
+        "Pools should be index arrays, not lists of ints."
+    assert numpy.array_equal(
+        my_data.indices(NNData.Set.TRAIN, NNData.Order.STATIC),
+        my_data.indices()), "A static order should not shuffle."
+
+
+def test_seeded_splits():
+    features = [[i] for i in range(50)]
+    one, two, other = (NNData.NNData(features, features, .5, seed=seed)
+                       for seed in (7, 7, 8))
+    assert numpy.array_equal(one.indices(), two.indices()), \
+        "The same seed should give the same split."
+    assert not numpy.array_equal(one.indices(), other.indices()), \
+        "Different seeds should give different splits."
+    state = one.save_state()
+    first = one.indices(NNData.Set.TRAIN, NNData.Order.SHUFFLE)
+    two.load_state(state)
+    assert numpy.array_equal(
+        two.indices(NNData.Set.TRAIN, NNData.Order.SHUFFLE), first), \
+        "load_state() should restore the random stream."
+    shared = copy.copy(one)
+    shared.load_state(state)
+    assert shared.rng is not one.rng, \
+        "load_state() should not change a generator it shares."
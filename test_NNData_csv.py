@@ -0,0 +1,63 @@
+import tracemalloc
+import pytest
+import numpy
+
+import NNData
+
+
+@pytest.fixture()
+def csv_file(tmp_path):
+    path = tmp_path / "data.csv"
+    rows = [f"{i / 10},{i % 2},{i * 2},{i + .5}" for i in range(10)]
+    rows.insert(4, "")
+    path.write_text("a,label,b,c\n" + "\n".join(rows))
+    return path
+
+
+def test_read_delimited(csv_file):
+    features, labels = NNData.read_delimited(csv_file, 1, skip_rows=1,
+                                             chunk_rows=3)
+    expected = numpy.array([[i / 10, i % 2, i * 2, i + .5]
+                            for i in range(10)])
+    assert numpy.array_equal(features, expected[:, [0, 2, 3]]), \
+        "Every column but the labels should be a feature, in order."
+    assert numpy.array_equal(labels, expected[:, [1]]), \
+        "Blank lines should be skipped and chunks joined in order."
+    features, labels = NNData.read_delimited(
+        csv_file, [-1, 1], feature_columns=[2], skip_rows=1,
+        dtype=numpy.float32)
+    assert features.dtype == labels.dtype == numpy.float32
+    assert numpy.array_equal(labels, expected[:, [3, 1]])
+    assert numpy.array_equal(features, expected[:, [2]])
+
+
+def test_bad_label_columns(csv_file):
+    for label_columns in (4, -5, [0, 4], [1, 1], [3, -1]):
+        with pytest.raises(ValueError):
+            NNData.read_delimited(csv_file, label_columns, skip_rows=1)
+
+
+def test_from_csv(csv_file):
+    my_data = NNData.NNData.from_csv(csv_file, 1, .5, skip_rows=1,
+                                     dtype=numpy.float32, chunk_rows=4)
+    assert my_data.dtype == numpy.float32
+    assert my_data.number_of_samples() == 10
+    assert my_data.number_of_samples(NNData.Set.TRAIN) == 5
+    my_data.prime_data()
+    features, labels = my_data.get_one_item()
+    assert len(features) == 3 and len(labels) == 1
+
+
+def test_peak_memory(tmp_path):
+    path = tmp_path / "big.csv"
+    data = numpy.random.default_rng(0).random((100000, 5))
+    numpy.savetxt(path, data, delimiter=",")
+    tracemalloc.start()
+    features, labels = NNData.read_delimited(path, -1, chunk_rows=1000)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert numpy.allclose(features, data[:, :4])
+    assert numpy.allclose(labels, data[:, 4:])
+    # the final arrays, plus a read buffer and one chunk being parsed
+    assert peak < data.nbytes + 3 * 2 ** 20, \
+        "Peak memory should stay near the size of the final arrays."
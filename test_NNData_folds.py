@@ -0,0 +1,109 @@
+import pytest
+import numpy
+
+import NNData
+import RMSE
+from FFBPNetwork import FFBPNetwork
+
+
+@pytest.fixture()
+def my_data():
+    # 30 samples of class 0 and 10 of class 1
+    features = [[i / 40] for i in range(40)]
+    labels = [[int(i % 4 == 0)] for i in range(40)]
+    return NNData.NNData(features, labels, .5)
+
+
+def count_ones(data, indices):
+    return int(data.labels[indices].sum())
+
+
+def test_stratified_split(my_data):
+    my_data.split_set(stratify=True)
+    train = my_data.indices(NNData.Set.TRAIN)
+    test = my_data.indices(NNData.Set.TEST)
+    assert len(train) == len(test) == 20
+    assert sorted(numpy.concatenate([train, test])) == list(range(40)), \
+        "A stratified split should still use every sample once."
+    assert count_ones(my_data, train) == count_ones(my_data, test) == 5, \
+        "Each class should be split in the same proportions."
+    my_data.split_set(.75, .2)
+    assert my_data.number_of_samples(NNData.Set.VALIDATION) == 6
+    assert count_ones(my_data, my_data.indices(NNData.Set.VALIDATION)) \
+        in (1, 2), "Validation should be stratified too."
+    assert my_data.save_state()["stratify"], \
+        "The choice to stratify should be kept in the state."
+
+
+def test_stratify_one_hot():
+    labels = numpy.eye(2)[[0] * 12 + [1] * 4]
+    my_data = NNData.NNData(numpy.zeros((16, 1)), labels, .5, stratify=True)
+    train = my_data.indices(NNData.Set.TRAIN)
+    assert my_data.labels[train, 1].sum() == 2, \
+        "Several label columns should be classed by their largest label."
+
+
+def test_stratify_needs_classes():
+    features = [[i] for i in range(10)]
+    labels = [[i / 10] for i in range(10)]
+    with pytest.raises(ValueError):
+        NNData.NNData(features, labels, .5, stratify=True)
+    my_data = NNData.NNData(features, labels, .5, validation_factor=.4)
+    sizes = [my_data.number_of_samples(target_set)
+             for target_set in NNData.Set]
+    before = my_data.save_state()
+    with pytest.raises(ValueError):
+        my_data.split_set(.8, .2, stratify=True)
+    assert [my_data.number_of_samples(target_set)
+            for target_set in NNData.Set] == sizes, \
+        "A refused stratified split should keep the current split."
+    after = my_data.save_state()
+    for key in ("train_factor", "validation_factor", "stratify",
+                "train_indices", "test_indices", "validation_indices"):
+        assert numpy.array_equal(after[key], before[key]), \
+            f"A refused stratified split should not change {key}."
+    my_data.split_set(.5, 0)
+    assert my_data.number_of_samples(NNData.Set.TRAIN) == 5, \
+        "A refused stratified split should leave stratifying off."
+    with pytest.raises(ValueError):
+        next(my_data.folds(2, stratify=True))
+    assert len(list(my_data.folds(2))) == 2, \
+        "Continuous labels should still fold without stratifying."
+
+
+def test_folds(my_data):
+    folds = list(my_data.folds(5, stratify=True))
+    assert len(folds) == 5
+    tests = []
+    for fold in folds:
+        assert fold.features is my_data.features \
+            and fold.labels is my_data.labels, \
+            "Folds should share the data set's arrays, not copy them."
+        test = fold.indices(NNData.Set.TEST)
+        train = fold.indices(NNData.Set.TRAIN)
+        assert len(test) == 8 and count_ones(my_data, test) == 2, \
+            "Stratified folds should each hold an even share of a class."
+        assert not set(test) & set(train) \
+            and len(test) + len(train) == 40
+        assert fold.pool_is_empty(NNData.Set.TRAIN), \
+            "Folds should start with empty pools."
+        tests.extend(test)
+    assert sorted(tests) == list(range(40)), \
+        "Every sample should be tested in exactly one fold."
+    assert my_data.number_of_samples(NNData.Set.TRAIN) == 20, \
+        "Making folds should not change the data set's own split."
+    for bad in (1, 41):
+        with pytest.raises(ValueError):
+            next(my_data.folds(bad))
+
+
+def test_train_on_fold(my_data):
+    my_data.split_set(new_validation_factor=.25)
+    fold = next(my_data.folds(4))
+    assert fold.number_of_samples(NNData.Set.VALIDATION) == 7, \
+        "Folds should hold out the validation factor of their training set."
+    network = FFBPNetwork(1, 1, RMSE.Euclidean)
+    network.train(fold, 2, 0, batch_size=4)
+    network.test(fold)
+    assert fold.pool_is_empty(NNData.Set.TEST), \
+        "Testing on a fold should use the fold's own test set."
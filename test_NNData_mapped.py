@@ -0,0 +1,82 @@
+import pickle
+import pytest
+import numpy
+
+import NNData
+import RMSE
+from FFBPNetwork import FFBPNetwork
+
+
+@pytest.fixture()
+def npy_files(tmp_path):
+    features = numpy.arange(2000, dtype=numpy.float32).reshape(1000, 2)
+    features /= 2000
+    labels = (numpy.arange(1000, dtype=numpy.float32) % 2).reshape(1000, 1)
+    numpy.save(tmp_path / "features.npy", features)
+    numpy.save(tmp_path / "labels.npy", labels)
+    return tmp_path / "features.npy", tmp_path / "labels.npy"
+
+
+def test_npy_files_are_mapped(npy_files):
+    my_data = NNData.NNData.from_files(*npy_files, 1)
+    assert my_data.dtype == numpy.float32, \
+        "File-backed data should take its dtype from the files."
+    assert isinstance(my_data.features.base, numpy.memmap) or \
+        isinstance(my_data.features, numpy.memmap), \
+        "Features should be read from the mapping, not copied."
+    assert not my_data.features.flags.writeable, \
+        "Mapped files should be opened read-only."
+    my_data.prime_data(order=NNData.Order.STATIC)
+    index = my_data.indices()[0]
+    features, labels = my_data.get_one_item()
+    assert numpy.array_equal(features, numpy.load(npy_files[0])[index])
+    assert labels[0] == index % 2
+    features, labels = my_data.get_batch(batch_size=5)
+    assert features.shape == (5, 2) and labels.shape == (5, 1)
+    assert numpy.array_equal(features, numpy.load(npy_files[0])[
+        my_data.indices()[1:6]])
+
+
+def test_raw_binary_files(tmp_path):
+    features = numpy.arange(30, dtype=numpy.float64).reshape(10, 3)
+    labels = numpy.arange(10, dtype=numpy.float64)
+    features.tofile(tmp_path / "features.bin")
+    labels.tofile(tmp_path / "labels.bin")
+    my_data = NNData.NNData.from_files(
+        tmp_path / "features.bin", tmp_path / "labels.bin", .5,
+        feature_columns=3, label_columns=1)
+    assert numpy.array_equal(my_data.features, features)
+    assert numpy.array_equal(my_data.labels[:, 0], labels)
+    with pytest.raises(ValueError):
+        NNData.NNData.from_files(tmp_path / "features.bin",
+                                 tmp_path / "labels.bin",
+                                 feature_columns=4, label_columns=1)
+    with pytest.raises(ValueError):
+        NNData.NNData.from_files(tmp_path / "features.bin",
+                                 tmp_path / "labels.bin")
+
+
+def test_pickles_as_file_names(npy_files):
+    my_data = NNData.NNData.from_files(*npy_files, .5)
+    pickled = pickle.dumps(my_data)
+    assert my_data.features.tobytes() not in pickled, \
+        "A file-backed data set should pickle without its data."
+    copied = pickle.loads(pickled)
+    assert copied.source == my_data.source
+    assert numpy.array_equal(copied.indices(), my_data.indices())
+    assert numpy.array_equal(copied.features, my_data.features)
+    copied.load_data([[1]], [[1]])
+    assert copied.source is None, \
+        "Loading data into memory should drop the file source."
+
+
+def test_parallel_training_maps_files(npy_files):
+    my_data = NNData.NNData.from_files(*npy_files, .02)
+    network = FFBPNetwork(2, 1, RMSE.Euclidean, dtype=numpy.float32)
+    network.add_hidden_layer(3)
+    before = [matrix.copy() for matrix in network.layers.weight_matrices]
+    error = network.train_parallel(my_data, 2, 0, batch_size=5, workers=2)
+    assert error > 0
+    for ours, theirs in zip(network.layers.weight_matrices, before):
+        assert not numpy.array_equal(ours, theirs), \
+            "Workers should train on the mapped files."
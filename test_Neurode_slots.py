@@ -0,0 +1,82 @@
+import pytest
+import numpy
+
+import Neurode
+from FFBPNeurode import FFBPNeurode
+from LayerList import LayerList
+
+
+def test_neurodes_have_no_instance_dict():
+    my_node = FFBPNeurode()
+    assert not hasattr(my_node, "__dict__"), \
+        "Neurode state should live in __slots__, not an instance dict."
+    with pytest.raises(AttributeError):
+        my_node.stray_attribute = 1
+
+
+def test_neighbor_group():
+    nodes = [Neurode.Neurode() for _ in range(3)]
+    group = Neurode.NeighborGroup(nodes)
+    assert list(group) == nodes, \
+        "NeighborGroup should keep the nodes in order."
+    assert group.positions == {nodes[0]: 0, nodes[1]: 1, nodes[2]: 2}, \
+        "NeighborGroup should give each node its slot."
+    assert group.reference_value == 0b111, \
+        "NeighborGroup reference value should have one bit per node."
+    assert Neurode.NeighborGroup.of(group) is group, \
+        "NeighborGroup.of should reuse an existing group."
+
+
+def test_weight_map():
+    my_node = Neurode.Neurode()
+    ups = [Neurode.Neurode() for _ in range(3)]
+    my_node.reset_neighbors(ups, Neurode.MultiLinkNode.Side.UPSTREAM)
+    weights = my_node._weights
+    assert isinstance(weights, Neurode.WeightMap), \
+        "Upstream weights should be held in a WeightMap."
+    assert numpy.array_equal(weights.array,
+                             [my_node.get_weight(up) for up in ups]), \
+        "WeightMap array should hold the weights in slot order."
+    weights[ups[1]] = .25
+    assert weights.array[1] == .25 and my_node.get_weight(ups[1]) == .25, \
+        "Setting a weight should write its slot in the array."
+    assert list(weights) == ups and len(weights) == 3, \
+        "WeightMap should iterate over the upstream nodes."
+    with pytest.raises(KeyError):
+        weights[Neurode.Neurode()]
+
+
+def test_layers_share_neighbor_groups():
+    layers = LayerList(3, 4, FFBPNeurode)
+    side = Neurode.MultiLinkNode.Side
+    outputs = layers.output_nodes
+    assert (outputs[0]._neighbors[side.UPSTREAM]
+            is outputs[1]._neighbors[side.UPSTREAM]), \
+        "Nodes in a layer should share one group of upstream neighbors."
+
+
+def test_reseed_and_given_weights():
+    side = Neurode.MultiLinkNode.Side
+    ups = [Neurode.Neurode() for _ in range(3)]
+    drawn = []
+    for _ in range(2):
+        Neurode.Neurode.reseed(11)
+        my_node = Neurode.Neurode()
+        my_node.reset_neighbors(ups, side.UPSTREAM)
+        drawn.append(my_node._weights.array.copy())
+    assert numpy.array_equal(*drawn), \
+        "Reseeding should repeat the weights of hand-wired neurodes."
+    Neurode.Neurode.reseed(11)
+    row = numpy.array([.1, .2, .3])
+    my_node.reset_neighbors(ups, side.UPSTREAM, row)
+    assert my_node._weights.array is row \
+        and my_node.get_weight(ups[2]) == .3, \
+        "Given weights should be kept as the weight storage."
+    layers = LayerList(3, 4, FFBPNeurode)
+    my_node.reset_neighbors(ups, side.UPSTREAM)
+    assert numpy.array_equal(my_node._weights.array, drawn[0]), \
+        "Given weights and LayerLists should not draw from the stream."
+    assert layers.output_nodes[1]._weights.array.base \
+        is layers.weight_matrices[0], \
+        "A LayerList should keep each neurode's weights in its matrix."
+    Neurode.Neurode.reseed()
@@ -0,0 +1,117 @@
+import copy
+import pytest
+import numpy
+
+import NNData
+import RMSE
+from DenseEngine import DenseEngine
+from FFBPNetwork import FFBPNetwork
+
+try:
+    import Optimizer
+except ImportError:
+    pytest.fail("Cannot import Optimizer. Is Optimizer.py present?")
+
+
+@pytest.fixture()
+def network():
+    my_network = FFBPNetwork(2, 1, RMSE.Euclidean)
+    my_network.add_hidden_layer(3)
+    return my_network
+
+
+@pytest.fixture()
+def xor_data():
+    features = [[0, 0], [1, 0], [0, 1], [1, 1]]
+    labels = [[0], [1], [1], [0]]
+    return NNData.NNData(features, labels, 1)
+
+
+def test_plain_sgd_matches_engine(network):
+    twin = copy.deepcopy(network)
+    engine = DenseEngine(network.layers)
+    optimized = DenseEngine(twin.layers, Optimizer.SGD())
+    inputs, labels = [[.1, .9], [.8, .2]], [[1], [0]]
+    engine.train_batch(inputs, labels)
+    optimized.train_batch(inputs, labels)
+    for ours, theirs in zip(twin.layers.weight_matrices,
+                            network.layers.weight_matrices):
+        assert numpy.array_equal(ours, theirs), \
+            "SGD without momentum should make the neurodes' update."
+
+
+def test_momentum():
+    weights = [numpy.zeros((1, 2))]
+    change = [numpy.array([[1., -2.]])]
+    optimizer = Optimizer.SGD(.1, momentum=.5)
+    optimizer.step(weights, change)
+    optimizer.step(weights, change)
+    assert numpy.allclose(weights[0], [[.25, -.5]]), \
+        "Velocity should be the change plus momentum * the last velocity."
+    nesterov = Optimizer.SGD(.1, momentum=.5, nesterov=True)
+    weights = [numpy.zeros((1, 2))]
+    nesterov.step(weights, change)
+    assert numpy.allclose(weights[0], [[.15, -.3]]), \
+        "Nesterov should step along the change plus momentum * velocity."
+    with pytest.raises(ValueError):
+        Optimizer.SGD(momentum=1)
+    with pytest.raises(ValueError):
+        Optimizer.SGD(nesterov=True)
+
+
+def test_rmsprop():
+    weights = [numpy.zeros((1, 2))]
+    optimizer = Optimizer.RMSProp(.01, decay=.75)
+    optimizer.step(weights, [numpy.array([[4., -.5]])])
+    assert numpy.allclose(weights[0], [[.02, -.02]]), \
+        "RMSProp should scale each step by its root mean square change."
+    assert optimizer.state[0]["square_average"].shape == (1, 2)
+
+
+def test_adam_state(network):
+    optimizer = Optimizer.get_optimizer("adam", learning_rate=.01)
+    weights = [matrix.copy() for matrix in network.layers.weight_matrices]
+    changes = [numpy.full_like(matrix, -3.) for matrix in weights]
+    optimizer.step(weights, changes)
+    for matrix, before in zip(weights, network.layers.weight_matrices):
+        assert numpy.allclose(matrix - before, -.01), \
+            "Adam's first step should be the learning rate in size."
+    assert optimizer.steps == 1
+    for matrix, state in zip(weights, optimizer.state):
+        assert set(state) == {"first_moment", "second_moment"}
+        for array in state.values():
+            assert array.shape == matrix.shape, \
+                "State arrays should match the shape of their matrix."
+    network.add_hidden_layer(2)
+    optimizer.step(network.layers.weight_matrices,
+                   [numpy.zeros_like(m)
+                    for m in network.layers.weight_matrices])
+    assert optimizer.steps == 1 and len(optimizer.state) == 3, \
+        "State should be rebuilt when the matrices change."
+    with pytest.raises(ValueError):
+        Optimizer.get_optimizer("adagrad")
+
+
+def test_float32_state():
+    weights = [numpy.zeros((2, 3), dtype=numpy.float32)]
+    optimizer = Optimizer.Adam(.01)
+    optimizer.step(weights, [numpy.ones((2, 3), dtype=numpy.float32)])
+    assert weights[0].dtype == numpy.float32
+    assert optimizer.state[0]["second_moment"].dtype == numpy.float32, \
+        "State arrays should match the dtype of their matrix."
+
+
+@pytest.mark.parametrize("make_optimizer", [
+    lambda: Optimizer.SGD(momentum=.9),
+    lambda: Optimizer.SGD(momentum=.9, nesterov=True),
+    lambda: Optimizer.RMSProp(.01),
+    lambda: Optimizer.Adam(.02)])
+def test_train_with_optimizer(xor_data, make_optimizer):
+    network = FFBPNetwork(2, 1, RMSE.Euclidean, seed=1)
+    network.add_hidden_layer(3)
+    plain = copy.deepcopy(network)
+    xor_data.reseed(1)
+    plain_error = plain.train(copy.deepcopy(xor_data), 300, 0)
+    error = network.train(xor_data, 300, 0, optimizer=make_optimizer())
+    assert error < plain_error, \
+        "Optimizers should train faster than plain gradient descent."
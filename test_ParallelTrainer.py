@@ -0,0 +1,105 @@
+import copy
+from multiprocessing.shared_memory import SharedMemory
+import pytest
+import numpy
+
+import NNData
+import RMSE
+from FFBPNetwork import FFBPNetwork
+
+try:
+    import ParallelTrainer
+except ImportError:
+    pytest.fail("Cannot import ParallelTrainer. Is ParallelTrainer.py "
+                "present?")
+
+
+@pytest.fixture()
+def data():
+    features = [[i / 20, (i % 4) / 4] for i in range(20)]
+    labels = [[i % 2, (i // 2) % 2] for i in range(20)]
+    return NNData.NNData(features, labels, 1)
+
+
+@pytest.fixture()
+def network():
+    my_network = FFBPNetwork(2, 2, RMSE.Euclidean)
+    my_network.add_hidden_layer(5)
+    return my_network
+
+
+def test_sync_matches_batch_training(network, data):
+    twin = copy.deepcopy(network)
+    twin_data = copy.deepcopy(data)
+    # steps of 3 * 2 samples, the last one 2 samples with a shard empty
+    network.train(data, 3, 0, batch_size=6)
+    twin.train_parallel(twin_data, 3, 0, batch_size=2, workers=3)
+    for ours, theirs in zip(twin.layers.weight_matrices,
+                            network.layers.weight_matrices):
+        assert numpy.allclose(ours, theirs), \
+            "Sync mode should train like batch training with one batch " \
+            "from each worker per step."
+
+
+def test_hogwild_trains(network, data):
+    before = [matrix.copy() for matrix in network.layers.weight_matrices]
+    network.train_parallel(data, 3, 0, batch_size=4, workers=2,
+                           mode="hogwild")
+    for ours, theirs in zip(network.layers.weight_matrices, before):
+        assert not numpy.array_equal(ours, theirs), \
+            "Hogwild training should copy its weights back."
+
+
+def test_bad_mode(network, data):
+    with pytest.raises(ValueError):
+        ParallelTrainer.ParallelTrainer(network.layers, data, 1, "async")
+
+
+def test_float32(data):
+    network = FFBPNetwork(2, 2, RMSE.Euclidean, dtype=numpy.float32)
+    network.add_hidden_layer(5)
+    data = NNData.NNData(data.features, data.labels, 1, numpy.float32)
+    twin = copy.deepcopy(network)
+    twin_data = copy.deepcopy(data)
+    network.train(data, 2, 0, batch_size=8)
+    twin.train_parallel(twin_data, 2, 0, batch_size=4, workers=2)
+    for ours, theirs in zip(twin.layers.weight_matrices,
+                            network.layers.weight_matrices):
+        assert ours.dtype == numpy.float32, \
+            "Parallel training should keep float32 weights."
+        assert numpy.allclose(ours, theirs, atol=1e-6), \
+            "Float32 sync mode should train like batch training."
+
+
+def test_evaluate_merges_shards(network, data):
+    with ParallelTrainer.ParallelTrainer(network.layers, data, 3) as trainer:
+        errors = trainer.evaluate(range(20), RMSE.Taxicab)
+    expected = RMSE.Taxicab().add_batch(network.predict(data.features),
+                                        data.labels)
+    assert errors.count == 20
+    assert errors.error == pytest.approx(expected.error), \
+        "Scores merged from the workers should match scoring in one go."
+
+
+def test_failed_start_releases_memory(network, data, monkeypatch):
+    names = []
+    real_share = ParallelTrainer.ParallelTrainer._share
+
+    def record_share(self, size, dtype):
+        block = real_share(self, size, dtype)
+        names.append(block.name)
+        return block
+
+    def broken_pool(*args):
+        raise OSError("no more processes")
+
+    monkeypatch.setattr(ParallelTrainer.ParallelTrainer, "_share",
+                        record_share)
+    monkeypatch.setattr(ParallelTrainer.multiprocessing, "Pool", broken_pool)
+    with pytest.raises(OSError):
+        ParallelTrainer.ParallelTrainer(network.layers, data, 2)
+    assert len(names) == 2
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
+            pytest.fail("A failed start should unlink its shared memory.")
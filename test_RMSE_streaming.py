@@ -0,0 +1,115 @@
+import pickle
+import tracemalloc
+import pytest
+import numpy
+
+import RMSE
+
+
+def test_error_matches_definition():
+    points = [([1, 2], [1, 4]), ([0, 0], [3, 4]), ([.5, .5], [.5, .5])]
+    for model, distances in ((RMSE.Euclidean, [2, 5, 0]),
+                             (RMSE.Taxicab, [2, 7, 0])):
+        errors = model()
+        assert errors.error == 0, "An empty accumulator should report 0."
+        for point in points:
+            errors += point
+        expected = numpy.sqrt(numpy.mean(numpy.square(distances)))
+        assert errors.error == pytest.approx(expected)
+        assert errors.count == 3
+        errors.reset()
+        assert errors.count == 0 and errors.error == 0
+
+
+def test_add_leaves_original():
+    errors = RMSE.Euclidean() + ([0, 0], [3, 4])
+    more = errors + ([1, 1], [1, 1])
+    assert errors.count == 1 and more.count == 2, \
+        "+ should return a new accumulator and leave the old one alone."
+    assert more.error == pytest.approx(numpy.sqrt(25 / 2))
+    with pytest.raises(ValueError):
+        errors += ([1, 2], [1])
+
+
+def test_memory_does_not_grow():
+    errors = RMSE.Euclidean()
+    point = (numpy.zeros(4), numpy.ones(4))
+    tracemalloc.start()
+    for _ in range(10000):
+        errors += point
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert size < 10000, \
+        "Adding points should not keep them in memory."
+    assert errors.error == pytest.approx(2)
+
+
+class Chebyshev(RMSE.RMSE):
+    """A user distance model with no array version."""
+
+    @staticmethod
+    def distance(predicted, expected):
+        return max(abs(p - e) for p, e in zip(predicted, expected))
+
+
+@pytest.mark.parametrize("model", [RMSE.Euclidean, RMSE.Taxicab,
+                                   Chebyshev])
+def test_add_batch_matches_points(model):
+    rng = numpy.random.default_rng(3)
+    predicted = rng.random((50, 3))
+    expected = rng.random((50, 3))
+    one_by_one = model()
+    for point in zip(predicted, expected):
+        one_by_one += point
+    bulk = model().add_batch(predicted[:20], expected[:20])
+    bulk.add_batch([], []).add_batch(predicted[20:20], expected[20:20])
+    assert bulk.count == 20, "An empty batch should add no points."
+    bulk.add_batch(predicted[20], expected[20])
+    bulk.add_batch(predicted[21:], expected[21:])
+    assert bulk.count == 50, "A 1-D batch should add a single point."
+    assert bulk.error == pytest.approx(one_by_one.error), \
+        "add_batch() should score like adding points one at a time."
+    with pytest.raises(ValueError):
+        model().add_batch(predicted, expected[:, :2])
+
+
+def test_array_distance_is_vectorized():
+    predicted = numpy.array([[0., 0.], [1., 1.]])
+    expected = numpy.array([[3., 4.], [1., 1.]])
+    assert numpy.array_equal(
+        RMSE.Euclidean.array_distance(predicted, expected), [5, 0])
+    assert numpy.array_equal(
+        RMSE.Taxicab.array_distance(predicted, expected), [7, 0])
+
+
+def test_merge_is_exact_and_associative():
+    rng = numpy.random.default_rng(5)
+    predicted = rng.random((30, 2))
+    expected = rng.random((30, 2))
+    whole = RMSE.Taxicab().add_batch(predicted, expected)
+    shards = [RMSE.Taxicab().add_batch(predicted[i:i + 10],
+                                       expected[i:i + 10])
+              for i in range(0, 30, 10)]
+    left = (shards[0] + shards[1]) + shards[2]
+    right = shards[0] + (shards[1] + shards[2])
+    assert left.count == right.count == 30
+    assert left.error == pytest.approx(whole.error)
+    assert right.error == pytest.approx(whole.error), \
+        "Merging shards in any grouping should give the whole RMSE."
+    assert shards[0].count == 10, "+ should not change its operands."
+    shards[0] += shards[1]
+    assert shards[0].count == 20, "+= should merge in place."
+    with pytest.raises(TypeError):
+        RMSE.Taxicab().merge(RMSE.Euclidean())
+
+
+def test_state_is_cheap():
+    errors = RMSE.Euclidean().add_batch(numpy.zeros((1000, 3)),
+                                        numpy.ones((1000, 3)))
+    copied = RMSE.Euclidean()
+    copied.load_state(errors.save_state())
+    assert copied.count == 1000 and copied.error == errors.error
+    unpickled = pickle.loads(pickle.dumps(errors))
+    assert unpickled.error == errors.error
+    assert len(pickle.dumps(errors)) < 200, \
+        "Accumulators should pickle to a few numbers, not their points."
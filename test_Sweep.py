@@ -0,0 +1,81 @@
+import pytest
+
+import NNData
+import RMSE
+
+try:
+    import Sweep
+except ImportError:
+    pytest.fail("Cannot import Sweep. Is Sweep.py present?")
+
+
+@pytest.fixture()
+def data():
+    features = [[i / 20, (i % 4) / 4] for i in range(20)]
+    labels = [[i % 2] for i in range(20)]
+    return NNData.NNData(features, labels, .75)
+
+
+def test_grid():
+    configs = Sweep.grid({"hidden_layers": [(), (3,)],
+                          "learning_rate": [.1, .2, .3]})
+    assert len(configs) == 6, \
+        "grid() should list every combination."
+    assert {"hidden_layers": (3,), "learning_rate": .2} in configs, \
+        "grid() is missing a combination."
+
+
+def test_random_search():
+    configs = Sweep.random_search({"epochs": (5, 10),
+                                   "learning_rate": (.01, .1),
+                                   "hidden_layers": [(2,), (4, 2)]}, 20)
+    assert len(configs) == 20, \
+        "random_search() should draw the requested number of configs."
+    for config in configs:
+        assert isinstance(config["epochs"], int) \
+            and 5 <= config["epochs"] <= 10, \
+            "Integer ranges should be drawn as integers."
+        assert .01 <= config["learning_rate"] <= .1, \
+            "Float ranges should be drawn uniformly between their ends."
+        assert config["hidden_layers"] in [(2,), (4, 2)], \
+            "Lists should be sampled from."
+
+
+def test_run_sweep(data):
+    configs = Sweep.grid({"hidden_layers": [(), (3, 2)],
+                          "epochs": [2, 4], "batch_size": [None, 4]})
+    rows = Sweep.run_sweep(configs, data, RMSE.Euclidean, workers=2)
+    assert len(rows) == len(configs), \
+        "run_sweep() should return one row per configuration."
+    scores = [row["test_rmse"] for row in rows]
+    assert scores == sorted(scores), \
+        "run_sweep() rows should be ranked best first."
+    assert all(row["seconds"] > 0 for row in rows), \
+        "run_sweep() should record the wall time of each run."
+    assert "rank" in Sweep.format_table(rows), \
+        "format_table() should lay out a header."
+
+
+def test_run_folds(data):
+    rows = Sweep.run_folds({"hidden_layers": (3,), "epochs": 2}, data, 4,
+                           stratify=True, workers=2)
+    assert [row["fold"] for row in rows] == [0, 1, 2, 3], \
+        "run_folds() should return one row per fold, in fold order."
+    assert all(row["test_rmse"] is not None for row in rows), \
+        "Each fold should be scored on its own test set."
+
+
+def test_seeded_sweep_repeats():
+    features = [[i / 20, (i % 4) / 4] for i in range(20)]
+    labels = [[i % 2] for i in range(20)]
+    configs = Sweep.random_search({"hidden_layers": [(2,), (3,)],
+                                   "epochs": (2, 4)}, 3, seed=9)
+    assert configs == Sweep.random_search({"hidden_layers": [(2,), (3,)],
+                                           "epochs": (2, 4)}, 3, seed=9), \
+        "random_search() should repeat itself for the same seed."
+    runs = [Sweep.run_sweep(configs, NNData.NNData(features, labels, .75,
+                                                   seed=2), workers=workers)
+            for workers in (1, 3)]
+    assert [row["test_rmse"] for row in runs[0]] == \
+        [row["test_rmse"] for row in runs[1]], \
+        "A seeded sweep should not depend on how work is spread out."